@@ -1,6 +1,8 @@
 import os
+import json
 import time
-from flask import Flask, render_template, request, jsonify, send_from_directory
+import uuid
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, stream_with_context
 from dotenv import load_dotenv
 
 # Import our modules
@@ -8,8 +10,17 @@ import utils.prompt_generator_groq as groq_utils
 import services.groq_prompt_generator as groq_generator
 import utils.script_splitter as script_utils
 import services.nvidia_image_generator as image_gen
+import services.scene_images as scene_images
 import services.audio_generator as audio_gen
 import services.video_generator as video_gen
+from services.job_queue import JobQueue, QueueFullError
+from services.workspace import get_workspace, get_or_create_workspace, create_workspace
+from services.pipeline import Pipeline, Stage
+from services.image_cache import image_cache
+from services.image_normalizer import normalized_cache
+from services.scene_manifest import load_manifest
+from services.media_probe import probe_duration
+from services.llm_cache import llm_cache
 import attention_detector
 
 # Load environment variables
@@ -20,13 +31,21 @@ app = Flask(__name__)
 # Configuration
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['STATIC_FOLDER'] = 'static'
-app.config['IMAGES_FOLDER'] = os.path.join('static', 'images')
-app.config['AUDIO_FOLDER'] = os.path.join('static', 'audio')
-app.config['VIDEO_FOLDER'] = os.path.join('static', 'video')
+# Each generation run gets its own workspace (images, audio, temp, video) in here
+app.config['WORKSPACES_FOLDER'] = os.path.join('static', 'jobs')
+app.config['VIDEO_WORKERS'] = int(os.environ.get('VIDEO_WORKERS', 2))
+app.config['VIDEO_MAX_PENDING'] = int(os.environ.get('VIDEO_MAX_PENDING', 20))
+# 'segments' re-encodes only the scenes that changed since the last render
+app.config['VIDEO_BACKEND'] = os.environ.get('VIDEO_BACKEND', 'segments')
 
 # Ensure directories exist
-for folder in [app.config['IMAGES_FOLDER'], app.config['AUDIO_FOLDER'], app.config['VIDEO_FOLDER']]:
-    os.makedirs(folder, exist_ok=True)
+os.makedirs(app.config['WORKSPACES_FOLDER'], exist_ok=True)
+
+# Background workers for long-running renders
+video_jobs = JobQueue(
+    max_workers=app.config['VIDEO_WORKERS'],
+    max_pending=app.config['VIDEO_MAX_PENDING']
+)
 
 # Routes
 @app.route('/')
@@ -43,26 +62,65 @@ def topic_to_script():
     data = request.json
     topic = data.get('topic')
     profile = data.get('profile') # Get profile from request
+    regenerate = bool(data.get('regenerate')) # Skip cached results
     
     if not topic:
         return jsonify({'error': 'Topic is required'}), 400
         
     try:
-        script = groq_utils.generate_script_from_topic(topic, profile)
+        script = groq_utils.generate_script_from_topic(topic, profile, use_cache=not regenerate)
         return jsonify({'script': script})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def sse_event(data, event=None):
+    """
+    Formats one Server-Sent Event.
+    """
+    message = f"data: {json.dumps(data)}\n\n"
+    if event:
+        message = f"event: {event}\n{message}"
+    return message
+
+@app.route('/api/topic-to-script/stream', methods=['POST'])
+def topic_to_script_stream():
+    data = request.json
+    topic = data.get('topic')
+    profile = data.get('profile')
+    regenerate = bool(data.get('regenerate'))
+    
+    if not topic:
+        return jsonify({'error': 'Topic is required'}), 400
+    
+    def generate():
+        try:
+            for text in groq_utils.stream_script_from_topic(topic, profile, use_cache=not regenerate):
+                yield sse_event({'text': text})
+            yield sse_event({}, event='done')
+        except Exception as e:
+            print(f"Error streaming script: {e}")
+            yield sse_event({'error': str(e)}, event='error')
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no' # Disable proxy buffering so tokens arrive immediately
+        }
+    )
+
 @app.route('/api/generate-prompts', methods=['POST'])
 def generate_prompts():
     data = request.json
     script = data.get('script')
+    regenerate = bool(data.get('regenerate'))
     
     if not script:
         return jsonify({'error': 'Script is required'}), 400
         
     try:
-        raw_scenes = groq_generator.generate_scene_prompts(script)
+        raw_scenes = groq_generator.generate_scene_prompts(script, use_cache=not regenerate)
         validated_scenes = script_utils.validate_scene_data(raw_scenes)
         return jsonify({'scenes': validated_scenes})
     except Exception as e:
@@ -72,36 +130,48 @@ def generate_prompts():
 def generate_images():
     data = request.json
     scenes = data.get('scenes')
+    # Total scenes in the script; omitted when only some scenes are regenerated
+    scene_count = data.get('scene_count')
     
     if not scenes:
         return jsonify({'error': 'Scenes data is required'}), 400
+    if scene_count is not None and (not isinstance(scene_count, int) or scene_count < 1):
+        return jsonify({'error': 'scene_count must be a positive integer'}), 400
         
     generated_images = []
+    failed_scenes = []
     
     try:
-        # Generate an image for each scene
-        for scene in scenes:
-            scene_num = scene.get('scene_number')
-            prompt = scene.get('image_prompt')
-            
-            filename = image_gen.generate_scene_image(
-                prompt, 
-                scene_num, 
-                app.config['IMAGES_FOLDER']
-            )
-            
+        workspace = get_or_create_workspace(data.get('workspace_id'), app.config['WORKSPACES_FOLDER'])
+        
+        # Generate images for all scenes concurrently (results keep scene order)
+        results = scene_images.generate_scene_images(
+            scenes,
+            workspace.images_dir,
+            image_gen,
+            scene_count
+        )
+        
+        for scene_num, filename in results:
             if filename:
                 # Add timestamp to bypass browser cache
-                url = f"/static/images/{filename}?t={int(time.time())}"
+                url = workspace.url_for(os.path.join(workspace.images_dir, filename))
+                url = f"{url}?t={int(time.time())}"
                 generated_images.append({
                     'scene_number': scene_num,
                     'url': url
                 })
+            else:
+                failed_scenes.append(scene_num)
         
         if not generated_images:
             return jsonify({'error': 'Failed to generate any images'}), 500
             
-        return jsonify({'images': generated_images})
+        return jsonify({
+            'images': generated_images,
+            'failed_scenes': failed_scenes,
+            'workspace_id': workspace.id
+        })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -115,49 +185,226 @@ def generate_audio():
         return jsonify({'error': 'Script is required'}), 400
         
     try:
-        # Clean script for TTS
-        clean_text = script_utils.clean_script_text(script)
+        workspace = get_or_create_workspace(data.get('workspace_id'), app.config['WORKSPACES_FOLDER'])
         
+        # Each scene is cleaned and synthesized separately
         filename = audio_gen.generate_narration(
-            clean_text, 
-            app.config['AUDIO_FOLDER']
+            script, 
+            workspace.audio_dir,
+            temp_dir=workspace.temp_dir
         )
         
         if filename:
-            url = f"/static/audio/{filename}?t={int(time.time())}"
-            return jsonify({'audio_url': url})
+            url = workspace.url_for(os.path.join(workspace.audio_dir, filename))
+            url = f"{url}?t={int(time.time())}"
+            return jsonify({'audio_url': url, 'workspace_id': workspace.id})
         else:
             return jsonify({'error': 'Failed to generate audio'}), 500
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def hls_playlist_path(workspace):
+    """
+    Each HLS render gets its own directory, so a player never picks up the
+    playlist of an earlier render.
+    """
+    return os.path.join(workspace.video_dir, f"hls_{uuid.uuid4().hex}", "index.m3u8")
+
+def render_video_job(workspace, scene_count=None, backend=None, render_profile=None, output_format="mp4",
+                     output_path=None, progress_callback=None):
+    """
+    Runs on a job worker thread. Returns the job result or raises on failure.
+    Draft renders go to their own file so they never replace a final render.
+    """
+    render_profile = render_profile or video_gen.DEFAULT_PROFILE
+    audio_path = os.path.join(workspace.audio_dir, audio_gen.NARRATION_FILENAME)
+    if output_path is None:
+        if output_format == "hls":
+            output_path = hls_playlist_path(workspace)
+        else:
+            output_name = "preview.mp4" if render_profile == 'draft' else "output.mp4"
+            output_path = os.path.join(workspace.video_dir, output_name)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    success = video_gen.create_video(
+        workspace.images_dir,
+        audio_path,
+        output_path,
+        scene_count,
+        progress_callback=progress_callback,
+        temp_dir=workspace.temp_dir,
+        backend=backend or app.config['VIDEO_BACKEND'],
+        profile=render_profile,
+        output_format=output_format
+    )
+    
+    if not success:
+        raise RuntimeError('Failed to create video')
+        
+    if output_format == "hls":
+        url = workspace.url_for(output_path)
+    else:
+        url = f"{workspace.url_for(output_path)}?t={int(time.time())}"
+    return {
+        'video_url': url,
+        'output_format': output_format,
+        'workspace_id': workspace.id,
+        'render_profile': render_profile
+    }
+
 @app.route('/api/create-video', methods=['POST'])
 def create_video_endpoint():
     data = request.json
     scene_count = data.get('scene_count')
     
+    backend = data.get('backend') or app.config['VIDEO_BACKEND']
+    render_profile = data.get('render_profile') or video_gen.DEFAULT_PROFILE
+    output_format = data.get('output_format') or 'mp4'
+    
+    if scene_count is not None and (not isinstance(scene_count, int) or scene_count < 1):
+        return jsonify({'error': 'scene_count must be a positive integer'}), 400
+    
+    if backend not in video_gen.BACKENDS:
+        return jsonify({'error': f"Unknown backend, expected one of: {', '.join(video_gen.BACKENDS)}"}), 400
+    
+    if render_profile not in video_gen.RENDER_PROFILES:
+        return jsonify({'error': f"Unknown render_profile, expected one of: {', '.join(video_gen.RENDER_PROFILES)}"}), 400
+    
+    if output_format not in video_gen.OUTPUT_FORMATS:
+        return jsonify({'error': f"Unknown output_format, expected one of: {', '.join(video_gen.OUTPUT_FORMATS)}"}), 400
+    
+    workspace = get_workspace(data.get('workspace_id'), app.config['WORKSPACES_FOLDER'])
+    if workspace is None:
+        return jsonify({'error': 'A valid workspace_id is required'}), 400
+    
+    # The scene manifest written during image generation says which scenes exist
+    if scene_count is None and load_manifest(workspace.images_dir) is None:
+        return jsonify({'error': 'No images have been generated for this workspace'}), 400
+    
+    # Reject missing or broken narration now rather than after queueing a render
+    video_seconds = probe_duration(os.path.join(workspace.audio_dir, audio_gen.NARRATION_FILENAME))
+    if not video_seconds:
+        return jsonify({'error': 'No narration audio has been generated for this workspace'}), 400
+    
     try:
-        audio_path = os.path.join(app.config['AUDIO_FOLDER'], "narration.mp3")
-        output_filename = "output.mp4"
-        output_path = os.path.join(app.config['VIDEO_FOLDER'], output_filename)
-        
-        success = video_gen.create_video(
-            app.config['IMAGES_FOLDER'],
-            audio_path,
-            output_path,
-            scene_count
+        # The playlist location is known up front, so the client can start
+        # polling it while the job is still queued or rendering
+        output_path = hls_playlist_path(workspace) if output_format == "hls" else None
+        job_id = video_jobs.submit(
+            'video', render_video_job, workspace, scene_count, backend, render_profile,
+            output_format=output_format, output_path=output_path
         )
+        response = {
+            'job_id': job_id,
+            'status_url': f"/api/jobs/{job_id}",
+            'video_seconds': round(video_seconds, 2)
+        }
+        if output_path:
+            response['stream_url'] = workspace.url_for(output_path)
+        return jsonify(response), 202
         
-        if success:
-            url = f"/static/video/{output_filename}?t={int(time.time())}"
-            return jsonify({'video_url': url})
-        else:
-            return jsonify({'error': 'Failed to create video'}), 500
-            
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    job = video_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+def topic_pipeline_job(topic, profile, regenerate=False, progress_callback=None):
+    """
+    Runs the whole topic-to-video flow as one job. Narration only needs the
+    script, so it runs alongside prompt and image generation; the render
+    starts once both branches are done. Scene prompts are streamed, and each
+    scene is sent to image generation as soon as the LLM finishes writing it.
+    """
+    workspace = create_workspace(app.config['WORKSPACES_FOLDER'])
+    
+    def script_stage(results, progress):
+        return groq_utils.generate_script_from_topic(topic, profile, use_cache=not regenerate)
+    
+    def scenes_stage(results, progress):
+        scenes = []
+        
+        def validated_scenes():
+            raw_scenes = groq_generator.stream_scene_prompts(results['script'], use_cache=not regenerate)
+            for i, raw_scene in enumerate(raw_scenes):
+                scene = script_utils.validate_scene(raw_scene, i)
+                scenes.append(scene)
+                yield scene
+        
+        images = []
+        for scene_num, filename in scene_images.generate_scene_images(validated_scenes(), workspace.images_dir, image_gen):
+            if filename:
+                url = workspace.url_for(os.path.join(workspace.images_dir, filename))
+                images.append({'scene_number': scene_num, 'url': url})
+        if not images:
+            raise RuntimeError('Failed to generate any images')
+        return {'scenes': scenes, 'images': images}
+    
+    def audio_stage(results, progress):
+        filename = audio_gen.generate_narration(results['script'], workspace.audio_dir, temp_dir=workspace.temp_dir)
+        if not filename:
+            raise RuntimeError('Failed to generate audio')
+        return workspace.url_for(os.path.join(workspace.audio_dir, filename))
+    
+    def video_stage(results, progress):
+        return render_video_job(workspace, progress_callback=progress)
+    
+    pipeline = Pipeline([
+        Stage('script', script_stage, weight=1),
+        Stage('scenes', scenes_stage, deps=['script'], weight=4),
+        Stage('audio', audio_stage, deps=['script'], weight=1),
+        Stage('video', video_stage, deps=['scenes', 'audio'], weight=4),
+    ])
+    results = pipeline.run(progress_callback)
+    
+    return {
+        'workspace_id': workspace.id,
+        'script': results['script'],
+        'scenes': results['scenes']['scenes'],
+        'images': results['scenes']['images'],
+        'audio_url': results['audio'],
+        'video_url': results['video']['video_url'],
+        'timings': pipeline.timings
+    }
+
+@app.route('/api/pipeline', methods=['POST'])
+def pipeline_endpoint():
+    data = request.json
+    topic = data.get('topic')
+    profile = data.get('profile')
+    
+    if not topic:
+        return jsonify({'error': 'Topic is required'}), 400
+    
+    try:
+        job_id = video_jobs.submit('pipeline', topic_pipeline_job, topic, profile, bool(data.get('regenerate')))
+        return jsonify({
+            'job_id': job_id,
+            'status_url': f"/api/jobs/{job_id}"
+        }), 202
+        
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cache-stats')
+def cache_stats():
+    return jsonify({
+        'images': image_cache.stats(),
+        'llm': llm_cache.stats(),
+        'segments': video_gen.segment_cache.stats(),
+        'normalized': normalized_cache.stats(),
+        'narration': audio_gen.narration_cache.stats()
+    })
+
 @app.route('/quiz')
 def quiz():
     return render_template('quiz.html')
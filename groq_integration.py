@@ -3,9 +3,11 @@
 Groq API integration for enhanced script analysis and prompt generation
 """
 
+import os
 import json
-import requests
 from typing import List, Dict, Any
+from services import http_clients
+from services.outbound_scheduler import scheduler
 
 class GroqScriptAnalyzer:
     def __init__(self, api_key: str):
@@ -70,7 +72,7 @@ Example output:
             }
             
             print("🤖 Analyzing script with Groq AI...")
-            response = requests.post(self.base_url, headers=self.headers, json=payload, timeout=30)
+            response = scheduler.request('groq', 'POST', self.base_url, headers=self.headers, json=payload, timeout=(http_clients.CONNECT_TIMEOUT, 30))
             
             if response.status_code == 200:
                 data = response.json()
@@ -137,7 +139,7 @@ Return ONLY the enhanced prompt, nothing else."""
                 "top_p": 0.8
             }
             
-            response = requests.post(self.base_url, headers=self.headers, json=payload, timeout=15)
+            response = scheduler.request('groq', 'POST', self.base_url, headers=self.headers, json=payload, timeout=(http_clients.CONNECT_TIMEOUT, 15))
             
             if response.status_code == 200:
                 data = response.json()
@@ -1,37 +1,168 @@
+import json
 import os
-import pyttsx3
+import shutil
+import tempfile
+from concurrent.futures import TimeoutError
+from services.tts_worker import tts_pool
+from services.ffmpeg_tools import run_ffmpeg
+from services.disk_cache import DiskCache, hash_key
+from services.media_probe import probe_duration
+import utils.script_splitter as script_utils
 
-def generate_narration(text, output_dir):
+# Longest a single scene may take to synthesize before the workers are restarted
+TTS_TIMEOUT = float(os.environ.get('TTS_TIMEOUT', 300))
+
+# The narration track is AAC in an MP4 container: small to serve, plays in
+# every browser and is muxed into the video without re-encoding
+NARRATION_FILENAME = "narration.m4a"
+NARRATION_BITRATE = os.environ.get('NARRATION_BITRATE', '96k')
+# Uncompressed copy, only written when a caller asks for it
+NARRATION_PCM_FILENAME = "narration.wav"
+
+NARRATION_CACHE_DIR = os.environ.get('NARRATION_CACHE_DIR', os.path.join('cache', 'narration'))
+NARRATION_CACHE_MAX_MB = int(os.environ.get('NARRATION_CACHE_MAX_MB', 512))
+
+# Synthesized scene clips, reused when the same text is spoken the same way
+narration_cache = DiskCache(NARRATION_CACHE_DIR, NARRATION_CACHE_MAX_MB * 1024 * 1024, name="narration")
+
+def narration_key(text, voice_id, rate, volume):
+    """
+    Cache key for one scene's clip. text is the cleaned scene text, so
+    markdown or whitespace changes alone don't cause a new synthesis.
+    """
+    return hash_key('narration', text, voice_id, rate, volume)
+
+def clip_duration(path):
+    """
+    Duration in seconds of a clip written by pyttsx3 (WAV, or AIFF on macOS).
+    """
+    duration = probe_duration(path)
+    if duration is None:
+        raise ValueError(f"Could not read the duration of {path}")
+    return duration
+
+def encode_narration(clip_paths, output_path, pcm_path=None):
+    """
+    Joins the scene clips in order and encodes them to AAC in a single
+    ffmpeg pass, so the raw PCM track is never written to disk. If pcm_path
+    is given, the same joined audio is also written there as 16-bit WAV.
+    """
+    args = []
+    for path in clip_paths:
+        args += ['-i', path]
+    labels = ''.join(f"[{i}:a]" for i in range(len(clip_paths)))
+    joined = f"{labels}concat=n={len(clip_paths)}:v=0:a=1"
+    
+    if pcm_path:
+        args += ['-filter_complex', f"{joined},asplit=2[aac][pcm]", '-map', '[aac]']
+    else:
+        args += ['-filter_complex', f"{joined}[aac]", '-map', '[aac]']
+    args += [
+        '-c:a', 'aac', '-b:a', NARRATION_BITRATE,
+        '-movflags', '+faststart',
+        output_path
+    ]
+    if pcm_path:
+        args += ['-map', '[pcm]', '-c:a', 'pcm_s16le', pcm_path]
+    run_ffmpeg(args)
+
+def narration_metadata_path(audio_path):
+    return os.path.splitext(audio_path)[0] + '.json'
+
+def save_narration_metadata(audio_path, durations, voice_id=None):
+    scenes = []
+    start = 0.0
+    for scene_num, duration in enumerate(durations, start=1):
+        scenes.append({'scene_number': scene_num, 'start': round(start, 3), 'duration': round(duration, 3)})
+        start += duration
+
+    with open(narration_metadata_path(audio_path), 'w') as f:
+        json.dump({
+            'audio': os.path.basename(audio_path),
+            'voice_id': voice_id,
+            'duration': round(start, 3),
+            'scenes': scenes
+        }, f, indent=2)
+
+def load_narration_metadata(audio_path):
     """
-    Generates audio narration from text using pyttsx3.
+    Returns the metadata saved with a narration track, or None.
+    """
+    try:
+        with open(narration_metadata_path(audio_path)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error reading narration metadata for {audio_path}: {e}")
+        return None
+
+def generate_narration(script, output_dir, keep_pcm=False, temp_dir=None):
+    """
+    Generates audio narration for a script using the shared pyttsx3 workers.
+    Every [SCENE] is synthesized separately, in parallel, and the clips are
+    joined into one track; each scene's start and duration are saved next
+    to it (see load_narration_metadata). Scenes whose text, voice, rate and
+    volume are unchanged come from the narration cache, so editing one
+    sentence only re-synthesizes its scene.
+    The track is saved as NARRATION_FILENAME (AAC); with keep_pcm an
+    uncompressed NARRATION_PCM_FILENAME is written as well. The scene clips
+    are written to a scratch directory under temp_dir (the system temp
+    directory by default) and removed once the track is encoded.
     Returns the filename of the generated audio.
     """
+    clips_dir = None
     try:
-        print("Initializing TTS engine...")
-        engine = pyttsx3.init()
-        
-        # Configure properties
-        engine.setProperty('rate', 150)    # Speed percent (can go over 100)
-        engine.setProperty('volume', 0.9)  # Volume 0-1
-        
-        # Try to select a good voice
-        voices = engine.getProperty('voices')
-        # Prefer a female voice if available, often clearer for narration
-        for voice in voices:
-            if "female" in voice.name.lower() or "zira" in voice.name.lower():
-                engine.setProperty('voice', voice.id)
-                break
-        
-        filename = "narration.mp3"
+        scenes = script_utils.split_script_scenes(script)
+        if not scenes:
+            raise ValueError("Script has no text to narrate")
+
+        # The narration cache keeps its own copy of every clip
+        if temp_dir:
+            os.makedirs(temp_dir, exist_ok=True)
+        clips_dir = tempfile.mkdtemp(prefix="narration-", dir=temp_dir)
+
+        # The voice id is only known once the engines are up
+        tts_pool.start()
+
+        clip_paths = []
+        keys = {}
+        futures = {}
+        for i, text in enumerate(scenes, start=1):
+            clip_path = os.path.join(clips_dir, f"scene_{i}.wav")
+            clip_paths.append(clip_path)
+            key = narration_key(text, tts_pool.voice_id, tts_pool.rate, tts_pool.volume)
+            if not narration_cache.copy_to(key, clip_path):
+                keys[clip_path] = key
+                futures[clip_path] = tts_pool.synthesize(text, clip_path)
+
+        print(f"Synthesizing {len(futures)} of {len(scenes)} scenes ({len(scenes) - len(futures)} cached)...")
+        for clip_path, future in futures.items():
+            future.result(timeout=TTS_TIMEOUT)
+            try:
+                narration_cache.put_file(keys[clip_path], clip_path)
+            except OSError as e:
+                print(f"Error caching narration clip {clip_path}: {e}")
+
+        durations = [clip_duration(path) for path in clip_paths]
+
+        filename = NARRATION_FILENAME
         filepath = os.path.join(output_dir, filename)
-        
+        pcm_path = os.path.join(output_dir, NARRATION_PCM_FILENAME) if keep_pcm else None
+
         print(f"Saving audio to {filepath}...")
-        # specific to pyttsx3, save_to_file processes the event loop
-        engine.save_to_file(text, filepath)
-        engine.runAndWait()
-        
+        encode_narration(clip_paths, filepath, pcm_path)
+        save_narration_metadata(filepath, durations, tts_pool.voice_id)
+
         return filename
-        
+
+    except TimeoutError:
+        print(f"Error generating audio: TTS took longer than {TTS_TIMEOUT}s, restarting the workers")
+        tts_pool.stop()
+        return None
     except Exception as e:
         print(f"Error generating audio: {e}")
         return None
+    finally:
+        if clips_dir:
+            shutil.rmtree(clips_dir, ignore_errors=True)
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def hash_key(*parts):
+    """
+    Builds a stable content hash from JSON-serializable parts
+    (dict key order does not matter).
+    """
+    encoded = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Size-bounded, content-addressed file cache with LRU eviction.
+    Entries are plain files named after their key; the access order is kept
+    in memory and rebuilt from file mtimes when the process starts.
+    """
+
+    def __init__(self, directory, max_bytes, name="cache"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries = OrderedDict()  # key -> size in bytes, oldest first
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def _load_index(self):
+        files = []
+        for fname in os.listdir(self.directory):
+            path = os.path.join(self.directory, fname)
+            if fname.startswith('.') or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            files.append((stat.st_mtime, fname, stat.st_size))
+
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+            self.total_bytes += size
+
+    def get(self, key):
+        """
+        Returns the cached file path for key, or None on a miss.
+        """
+        path = self._path(key)
+        with self.lock:
+            if key in self.entries and os.path.exists(path):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                try:
+                    os.utime(path, None)
+                except OSError:
+                    pass
+                return path
+
+            if key in self.entries:
+                # File was removed behind our back
+                self.total_bytes -= self.entries.pop(key)
+            self.misses += 1
+            return None
+
+    def copy_to(self, key, dest_path):
+        """
+        Copies the cached entry to dest_path. Returns True on a hit.
+        """
+        path = self.get(key)
+        if path is None:
+            return False
+        try:
+            shutil.copyfile(path, dest_path)
+            return True
+        except OSError as e:
+            print(f"Error reading {self.name} cache entry {key}: {e}")
+            return False
+
+    def put_bytes(self, key, data):
+        # Write to a temp file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            self._commit(key, tmp_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put_file(self, key, src_path):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        os.close(fd)
+        try:
+            shutil.copyfile(src_path, tmp_path)
+            self._commit(key, tmp_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def delete(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _commit(self, key, tmp_path):
+        size = os.path.getsize(tmp_path)
+        with self.lock:
+            os.replace(tmp_path, self._path(key))
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)
+            self.entries[key] = size
+            self.total_bytes += size
+            self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries until we're under budget
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
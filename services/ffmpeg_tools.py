@@ -0,0 +1,97 @@
+import subprocess
+import threading
+
+def ffmpeg_binary():
+    """
+    Path to the ffmpeg executable moviepy is configured with, so both
+    rendering backends use the same build.
+    """
+    try:
+        from moviepy.config import get_setting
+        return get_setting("FFMPEG_BINARY")
+    except Exception:
+        pass
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+def run_ffmpeg(args, duration=None, progress_callback=None):
+    """
+    Runs ffmpeg with args. If duration and progress_callback are given,
+    reports the encoded fraction of duration as ffmpeg works.
+    Raises RuntimeError with ffmpeg's error output on failure.
+    """
+    cmd = [ffmpeg_binary(), '-hide_banner', '-loglevel', 'error', '-nostdin', '-y']
+    if progress_callback and duration:
+        cmd += ['-progress', 'pipe:1', '-nostats']
+    cmd += [str(arg) for arg in args]
+
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True
+    )
+
+    # Drain stderr on a thread so a chatty ffmpeg can't block on a full pipe
+    errors = []
+    reader = threading.Thread(target=lambda: errors.extend(process.stderr), daemon=True)
+    reader.start()
+
+    for line in process.stdout:
+        if progress_callback and duration and line.startswith('out_time_us='):
+            try:
+                seconds = int(line.split('=', 1)[1]) / 1000000.0
+                progress_callback(min(seconds / duration, 1.0))
+            except ValueError:
+                pass
+
+    process.wait()
+    reader.join()
+
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed ({process.returncode}): {''.join(errors[-20:]).strip()}")
+
+def even(value):
+    """
+    libx264 with yuv420p needs even frame dimensions.
+    """
+    return max(2, int(value) // 2 * 2)
+
+def is_aac(path, chunk_size=1024 * 1024):
+    """
+    True if the file already holds AAC audio, judged from its bytes: a raw
+    ADTS stream, or an MP4/M4A container with an mp4a sample entry.
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(12)
+            if len(header) < 2:
+                return False
+            # ADTS sync word with layer 0 (MP3 frames use a non-zero layer)
+            if header[0] == 0xFF and (header[1] & 0xF6) == 0xF0:
+                return True
+            if header[4:8] != b'ftyp':
+                return False
+
+            # The sample description can sit at either end of the file
+            f.seek(0)
+            tail = b''
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                if b'mp4a' in tail + chunk:
+                    return True
+                tail = chunk[-3:]
+    except OSError:
+        pass
+    return False
+
+def audio_codec_args(audio_path):
+    """
+    Output audio settings for muxing audio_path into an MP4: copied as is
+    when it is already AAC, otherwise encoded to AAC once.
+    """
+    if is_aac(audio_path):
+        return ['-c:a', 'copy']
+    return ['-c:a', 'aac']
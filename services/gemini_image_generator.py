@@ -2,6 +2,9 @@ import os
 import google.generativeai as genai
 from PIL import Image
 import io
+from services.outbound_scheduler import scheduler
+
+PROVIDER = "gemini"
 
 # Configure the library
 def configure_gemini():
@@ -28,6 +31,8 @@ def generate_scene_image(prompt, scene_num, output_dir):
         )
         full_prompt = f"{style_guide} Visualization: {prompt}"
         
+        # Not cached (unlike the seeded providers): Imagen is unseeded, so
+        # regenerating a scene should give a new image, not the previous one
         print(f"Generating image for Scene {scene_num} with Gemini...")
         
         # Using the standard image generation model
@@ -39,7 +44,9 @@ def generate_scene_image(prompt, scene_num, output_dir):
         # As of early 2025/late 2024, the python SDK supports image generation via:
         model = genai.ImageGenerationModel("imagen-3.0-generate-001")
         
-        response = model.generate_images(
+        response = scheduler.call(
+            PROVIDER,
+            model.generate_images,
             prompt=full_prompt,
             number_of_images=1,
         )
@@ -1,24 +1,21 @@
 import os
 import json
 import re
-from groq import Groq
+from services.http_clients import get_groq_client
+from services.outbound_scheduler import scheduler
+from services.llm_cache import llm_cache, llm_key
+from utils.json_stream import iter_json_array
+from utils.script_splitter import split_script_scenes
 
-def get_client():
-    api_key = os.environ.get("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY environment variable not set")
-    return Groq(api_key=api_key)
+PROMPT_MODEL = "llama-3.3-70b-versatile"
+PROMPT_TEMPERATURE = 0.2 # Low temperature for consistent JSON
 
-def generate_scene_prompts(script):
-    """
-    Splits the script into scenes and generates detailed image prompts for each scene.
-    Returns a list of dictionaries with keys: 
-    scene_number, concept, diagram_type, visual_elements, relationships, image_prompt.
-    """
-    client = get_client()
-    
-    system_prompt = """You are an expert visual director for educational videos. 
-    Analyze the provided teaching script and split it into logical scenes.
+SYSTEM_PROMPT = """You are an expert visual director for educational videos. 
+    Analyze the provided teaching script and split it into scenes.
+    If the script is divided into numbered scenes ("Scene 1:", "Scene 2:", ...),
+    create exactly one scene for each of them, in the same order, with
+    scene_number set to its number. Do not merge, split or skip scenes: the
+    narration is timed per numbered scene. Otherwise split it into logical scenes.
     
     GOAL:
     Generate high-quality, detailed, teaching-slide style image prompts for each scene.
@@ -57,15 +54,57 @@ def generate_scene_prompts(script):
       }
     ]
     """
+
+def get_client():
+    api_key = os.environ.get("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("GROQ_API_KEY environment variable not set")
+    return get_groq_client(api_key)
+
+def format_script(script):
+    """
+    Numbers the [SCENE] blocks of a script so the model returns one scene
+    per block, matching the per-scene narration timings.
+    """
+    scenes = split_script_scenes(script)
+    if len(scenes) < 2:
+        return script
+    return "\n\n".join(f"Scene {i}: {text}" for i, text in enumerate(scenes, start=1))
+
+def prompt_cache_key(script):
+    # Keyed on what the model is sent, so results cached before scenes
+    # were numbered aren't reused
+    return llm_key(PROMPT_MODEL, format_script(script), temperature=PROMPT_TEMPERATURE)
+
+def build_prompt_messages(script):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Script to visualize:\n\n{format_script(script)}"}
+    ]
+
+def generate_scene_prompts(script, use_cache=True):
+    """
+    Splits the script into scenes and generates detailed image prompts for each scene.
+    Returns a list of dictionaries with keys: 
+    scene_number, concept, diagram_type, visual_elements, relationships, image_prompt.
+    Pass use_cache=False to bypass cached results.
+    """
+    cache_key = prompt_cache_key(script)
+    if use_cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            print("LLM cache hit for scene prompts")
+            return cached
+    
+    client = get_client()
     
     try:
-        response = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Script to visualize:\n\n{script}"}
-            ],
-            model="llama-3.3-70b-versatile",
-            temperature=0.2, # Low temperature for consistent JSON
+        response = scheduler.call(
+            'groq',
+            client.chat.completions.create,
+            messages=build_prompt_messages(script),
+            model=PROMPT_MODEL,
+            temperature=PROMPT_TEMPERATURE,
             max_tokens=2048
         )
         
@@ -76,6 +115,7 @@ def generate_scene_prompts(script):
         
         # Parse JSON
         scenes = json.loads(content)
+        llm_cache.set(cache_key, scenes)
         return scenes
 
     except Exception as e:
@@ -83,6 +123,51 @@ def generate_scene_prompts(script):
         # Return a fallback or re-raise
         raise e
 
+def stream_scene_prompts(script, use_cache=True):
+    """
+    Same as generate_scene_prompts, but yields each scene dictionary as soon
+    as the model finishes writing it, so image generation for the first
+    scenes can start while later ones are still being decoded.
+    """
+    cache_key = prompt_cache_key(script)
+    if use_cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            print("LLM cache hit for scene prompts")
+            yield from cached
+            return
+    
+    client = get_client()
+    
+    try:
+        stream = scheduler.call(
+            'groq',
+            client.chat.completions.create,
+            messages=build_prompt_messages(script),
+            model=PROMPT_MODEL,
+            temperature=PROMPT_TEMPERATURE,
+            max_tokens=2048,
+            stream=True
+        )
+        
+        def text_chunks():
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        
+        scenes = []
+        for scene in iter_json_array(text_chunks()):
+            scenes.append(scene)
+            yield scene
+        
+        # Only reached once the whole array has arrived; a truncated
+        # response raises above and is never cached
+        llm_cache.set(cache_key, scenes)
+
+    except Exception as e:
+        print(f"Error streaming prompts: {e}")
+        raise e
+
 def CleanJsonMarkdown(json_content):
     """
     Removes markdown code fencing (```json ... ```) if present.
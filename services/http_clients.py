@@ -0,0 +1,71 @@
+import os
+import threading
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from groq import Groq
+
+# Timeouts (seconds) applied to every outbound call unless overridden
+CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 5))
+READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', 60))
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# Keep-alive connections kept open per host
+DEFAULT_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', 10))
+HOST_POOL_SIZES = {
+    'ai.api.nvidia.com': int(os.environ.get('NVIDIA_POOL_SIZE', 8)),
+    'api.pexels.com': int(os.environ.get('PEXELS_POOL_SIZE', 8)),
+    'images.pexels.com': int(os.environ.get('PEXELS_POOL_SIZE', 8)),
+    'api.groq.com': int(os.environ.get('GROQ_POOL_SIZE', 8)),
+}
+
+_sessions = {}
+_groq_clients = {}
+_lock = threading.Lock()
+
+def get_session(url):
+    """
+    Returns the process-wide requests session for the URL's host, so
+    repeated calls reuse TCP+TLS connections instead of reconnecting.
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname or ''
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            pool_size = HOST_POOL_SIZES.get(host, DEFAULT_POOL_SIZE)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[host] = session
+        return session
+
+def request(method, url, timeout=None, **kwargs):
+    return get_session(url).request(method, url, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+def get_groq_client(api_key):
+    """
+    Returns a shared Groq client for this API key. The SDK keeps its own
+    httpx connection pool, so building one per call throws that pool away.
+    """
+    with _lock:
+        client = _groq_clients.get(api_key)
+        if client is None:
+            pool_size = HOST_POOL_SIZES['api.groq.com']
+            http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+            )
+            # Retries are handled by the outbound scheduler
+            client = Groq(api_key=api_key, http_client=http_client, max_retries=0)
+            _groq_clients[api_key] = client
+        return client
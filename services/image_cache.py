@@ -0,0 +1,35 @@
+import os
+from services.disk_cache import DiskCache, hash_key
+
+IMAGE_CACHE_DIR = os.environ.get('IMAGE_CACHE_DIR', os.path.join('cache', 'images'))
+IMAGE_CACHE_MAX_MB = int(os.environ.get('IMAGE_CACHE_MAX_MB', 1024))
+
+# Shared by all image providers; keys include the provider name
+image_cache = DiskCache(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_MB * 1024 * 1024, name="images")
+
+def image_key(provider, prompt, params):
+    """
+    Cache key for an image: same provider, prompt and generation
+    parameters means the same image. Only use it for deterministic
+    providers; for generative models the params must include the seed,
+    or every regeneration would return the cached image.
+    """
+    return hash_key(provider, prompt, params)
+
+def load_cached_image(key, output_dir, filename):
+    """
+    Copies a cached image into output_dir as filename.
+    Returns filename on a hit, None on a miss.
+    """
+    filepath = os.path.join(output_dir, filename)
+    if image_cache.copy_to(key, filepath):
+        print(f"Image cache hit: {filepath}")
+        return filename
+    return None
+
+def store_image(key, filepath):
+    try:
+        image_cache.put_file(key, filepath)
+    except OSError as e:
+        # A cache failure should never fail the generation itself
+        print(f"Error caching image {filepath}: {e}")
@@ -2,6 +2,16 @@ import os
 import torch
 from diffusers import StableDiffusionPipeline, DiffusionPipeline
 from PIL import Image
+from services.outbound_scheduler import scheduler
+from services.image_cache import image_key, load_cached_image, store_image
+
+PROVIDER = "local"
+
+# Using a lightweight model or standard 1.5 depending on resource availability
+MODEL_ID = "runwayml/stable-diffusion-v1-5"
+
+# Fixed seed so the same prompt gives the same image, which makes it cacheable
+SEED = 0
 
 # Global pipeline cache to avoid reloading model on every request
 pipe = None
@@ -12,9 +22,8 @@ def get_pipeline():
         return pipe
         
     print("Loading Stable Diffusion model...")
-    # Using a lightweight model or standard 1.5 depending on resource availability
     # fast-dream-shaper-v1-5-turbo is good for speed/quality balance
-    model_id = "runwayml/stable-diffusion-v1-5" 
+    model_id = MODEL_ID
     
     auth_token = os.environ.get("HF_TOKEN")
     
@@ -51,22 +60,39 @@ def generate_scene_image(prompt, scene_num, output_dir):
     Generates an image for a specific scene and saves it.
     """
     try:
-        pipeline = get_pipeline()
-        
         # Enhanced negative prompt for educational style
         negative_prompt = "text, writing, watermark, signature, ugly, distorted, realistic photo, cinematic, dramatic lighting, fantasy, complex, cluttered, blurry, bad anatomy"
+        num_inference_steps = 25 if torch.cuda.is_available() else 15 # Fewer steps on CPU
+        
+        filename = f"scene_{scene_num}.png"
+        cache_key = image_key(PROVIDER, prompt, {
+            "model": MODEL_ID,
+            "negative_prompt": negative_prompt,
+            "steps": num_inference_steps,
+            "guidance_scale": 7.5,
+            "seed": SEED
+        })
+        if load_cached_image(cache_key, output_dir, filename):
+            return filename
+        
+        pipeline = get_pipeline()
         
         print(f"Generating image for Scene {scene_num}...")
-        image = pipeline(
+        # Goes through the scheduler so only one generation uses the model at a time
+        image = scheduler.call(
+            PROVIDER,
+            pipeline,
             prompt=prompt, 
             negative_prompt=negative_prompt,
-            num_inference_steps=25 if torch.cuda.is_available() else 15, # Fewer steps on CPU
-            guidance_scale=7.5
+            num_inference_steps=num_inference_steps,
+            guidance_scale=7.5,
+            # CPU generator: the same seed gives the same image on CPU and CUDA
+            generator=torch.Generator("cpu").manual_seed(SEED)
         ).images[0]
         
-        filename = f"scene_{scene_num}.png"
         filepath = os.path.join(output_dir, filename)
         image.save(filepath)
+        store_image(cache_key, filepath)
         print(f"Saved: {filepath}")
         return filename
         
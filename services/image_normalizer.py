@@ -0,0 +1,70 @@
+import os
+from PIL import Image, ImageOps
+from services.disk_cache import DiskCache, hash_file, hash_key
+
+# How an image whose aspect ratio differs from the canvas is fitted:
+# "letterbox" scales it to fit and pads with black, "crop" fills and trims
+FIT_MODES = ("letterbox", "crop")
+FIT_MODE = os.environ.get('VIDEO_FIT_MODE', 'letterbox')
+
+NORMALIZED_CACHE_DIR = os.environ.get('NORMALIZED_CACHE_DIR', os.path.join('cache', 'normalized'))
+NORMALIZED_CACHE_MAX_MB = int(os.environ.get('NORMALIZED_CACHE_MAX_MB', 1024))
+
+# Scene images already converted to a given canvas size and fit mode
+normalized_cache = DiskCache(NORMALIZED_CACHE_DIR, NORMALIZED_CACHE_MAX_MB * 1024 * 1024, name="normalized")
+
+def fit_image(image, size, mode=FIT_MODE):
+    """
+    Returns an RGB copy of image that is exactly size (w, h).
+    """
+    image = image.convert('RGB')
+    if image.size == tuple(size):
+        return image
+
+    if mode == "crop":
+        return ImageOps.fit(image, size, method=Image.LANCZOS)
+
+    width, height = size
+    scale = min(width / image.width, height / image.height)
+    resized = image.resize(
+        (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+        Image.LANCZOS
+    )
+    canvas = Image.new('RGB', size)
+    canvas.paste(resized, ((width - resized.width) // 2, (height - resized.height) // 2))
+    return canvas
+
+def normalize_image(image_path, size, output_path, mode=FIT_MODE):
+    """
+    Writes image_path converted to size (w, h) as an RGB PNG at output_path,
+    reusing an earlier conversion of the same image when there is one.
+    Returns output_path.
+    """
+    if mode not in FIT_MODES:
+        raise ValueError(f"Unknown fit mode: {mode}")
+
+    key = hash_key('normalized', hash_file(image_path), list(size), mode)
+    if normalized_cache.copy_to(key, output_path):
+        return output_path
+
+    with Image.open(image_path) as img:
+        # Low compression: these are short-lived intermediates read by the encoder
+        fit_image(img, size, mode).save(output_path, 'PNG', compress_level=1)
+
+    try:
+        normalized_cache.put_file(key, output_path)
+    except OSError as e:
+        print(f"Error caching normalized image {output_path}: {e}")
+    return output_path
+
+def normalize_images(image_paths, size, output_dir, mode=FIT_MODE):
+    """
+    Normalizes every scene image to size into output_dir.
+    Returns the new paths in the same order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for i, image_path in enumerate(image_paths, start=1):
+        output_path = os.path.join(output_dir, f"scene_{i}.png")
+        paths.append(normalize_image(image_path, size, output_path, mode))
+    return paths
@@ -0,0 +1,124 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """Raised when too many jobs are already waiting for a worker."""
+
+
+class Job:
+    """
+    State of a single background job. Updated by the worker thread,
+    read by the status endpoint.
+    """
+
+    def __init__(self, job_id, kind):
+        self.id = job_id
+        self.kind = kind
+        self.status = "queued"  # queued -> running -> finished / failed
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Lock()
+
+    def set_progress(self, fraction):
+        """Progress callback handed to the job function (0.0 - 1.0)."""
+        with self.lock:
+            self.progress = max(self.progress, min(max(fraction, 0.0), 1.0))
+
+    def eta_seconds(self):
+        """
+        Estimated time left, extrapolated from progress so far.
+        Caller holds the lock.
+        """
+        if self.status != "running" or not self.started_at or self.progress <= 0:
+            return None
+        elapsed = time.time() - self.started_at
+        return round(elapsed * (1 - self.progress) / self.progress, 1)
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'job_id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'progress': round(self.progress * 100, 1),
+                'eta_seconds': self.eta_seconds(),
+                'result': self.result,
+                'error': self.error,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at
+            }
+
+
+class JobQueue:
+    """
+    Runs jobs on a bounded pool of worker threads so HTTP requests can
+    return a job ID immediately and poll for the result.
+    """
+
+    def __init__(self, max_workers=2, max_pending=20, max_history=200):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_history = max_history
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+
+    def submit(self, kind, fn, *args, **kwargs):
+        """
+        Queues fn(*args, progress_callback=..., **kwargs) and returns the job ID.
+        The function's return value becomes the job result.
+        """
+        with self.lock:
+            pending = sum(1 for job in self.jobs.values() if job.status == "queued")
+            if pending >= self.max_pending:
+                raise QueueFullError("Too many jobs queued, please try again later")
+
+            job = Job(uuid.uuid4().hex, kind)
+            self.jobs[job.id] = job
+            self._prune()
+
+        self.executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _run(self, job, fn, args, kwargs):
+        with job.lock:
+            job.status = "running"
+            job.started_at = time.time()
+
+        try:
+            result = fn(*args, progress_callback=job.set_progress, **kwargs)
+            with job.lock:
+                job.result = result
+                job.progress = 1.0
+                job.status = "finished"
+        except Exception as e:
+            print(f"Job {job.id} ({job.kind}) failed: {e}")
+            with job.lock:
+                job.error = str(e)
+                job.status = "failed"
+        finally:
+            with job.lock:
+                job.finished_at = time.time()
+
+    def _prune(self):
+        # Drop the oldest completed jobs so the registry doesn't grow forever
+        while len(self.jobs) > self.max_history:
+            for job_id, job in self.jobs.items():
+                if job.status in ("finished", "failed"):
+                    del self.jobs[job_id]
+                    break
+            else:
+                break
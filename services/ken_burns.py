@@ -0,0 +1,126 @@
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Zoom grows by this fraction per second of scene time (1.0 -> 1.04 after 1s)
+ZOOM_RATE = 0.04
+
+def zoom_schedule(duration, fps, rate=ZOOM_RATE):
+    """
+    Precomputes the zoom factor for every frame of a scene.
+    """
+    frame_count = max(1, int(round(duration * fps)))
+    return 1.0 + rate * (np.arange(frame_count) / fps)
+
+def zoom_matrices(scales, width, height):
+    """
+    Affine matrices that scale about the image centre, one per frame.
+    Equivalent to resizing the frame by `scale` and centre-cropping it back
+    to its original size, which is what clip.resize() + compose used to do.
+    """
+    cx = (width - 1) / 2.0
+    cy = (height - 1) / 2.0
+    matrices = np.zeros((len(scales), 2, 3), dtype=np.float64)
+    matrices[:, 0, 0] = scales
+    matrices[:, 1, 1] = scales
+    matrices[:, 0, 2] = (1 - scales) * cx
+    matrices[:, 1, 2] = (1 - scales) * cy
+    return matrices
+
+def load_rgb(image_path, size=None):
+    """
+    Loads an image as an RGB array, resized once to size (w, h) if given.
+    """
+    image = np.asarray(Image.open(image_path).convert('RGB'))
+    if size and tuple(size) != (image.shape[1], image.shape[0]):
+        image = cv2.resize(image, tuple(size), interpolation=cv2.INTER_AREA)
+    return np.ascontiguousarray(image)
+
+class KenBurnsZoom:
+    """
+    Renders zoomed frames of a still image with a single OpenCV affine warp
+    per frame, instead of a Python-level PIL resize.
+    """
+    def __init__(self, image, duration, fps, rate=ZOOM_RATE):
+        self.image = image
+        self.fps = fps
+        self.height, self.width = image.shape[:2]
+        self.matrices = zoom_matrices(zoom_schedule(duration, fps, rate), self.width, self.height)
+
+    def frame_at(self, t):
+        index = min(int(round(t * self.fps)), len(self.matrices) - 1)
+        return cv2.warpAffine(
+            self.image,
+            self.matrices[max(index, 0)],
+            (self.width, self.height),
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_REPLICATE
+        )
+
+def ken_burns_clip(image_path, duration, fps, rate=ZOOM_RATE, size=None):
+    """
+    Returns a moviepy clip of the image slowly zooming in,
+    optionally rendered at size (w, h).
+    """
+    from moviepy.editor import VideoClip
+
+    zoom = KenBurnsZoom(load_rgb(image_path, size), duration, fps, rate)
+    return VideoClip(zoom.frame_at, duration=duration)
+
+def _legacy_zoom_clip(image_path, duration, rate=ZOOM_RATE):
+    # The renderer before the affine warp: moviepy resizes every frame up
+    # with PIL, and the compose concatenation blits its centre onto a canvas
+    from moviepy.editor import ImageClip, concatenate_videoclips
+
+    clip = ImageClip(image_path).set_duration(duration).resize(lambda t: 1 + rate * t)
+    return concatenate_videoclips([clip], method="compose")
+
+def _zoom_clip(image_path, duration, fps, rate=ZOOM_RATE):
+    # The renderer now: warped frames, chained without compositing
+    from moviepy.editor import concatenate_videoclips
+
+    return concatenate_videoclips([ken_burns_clip(image_path, duration, fps, rate)], method="chain")
+
+def _time_frames(clip, frame_count, fps):
+    start = time.perf_counter()
+    for i in range(frame_count):
+        clip.get_frame(i / fps)
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    # Benchmark: the old moviepy resize + compose clip vs the affine warp
+    # clip, both rendered frame by frame as write_videofile would
+    import argparse
+    import json
+    import os
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Benchmark the Ken Burns zoom")
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=1024)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--fps", type=int, default=24)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+    frame_count = len(zoom_schedule(args.duration, args.fps))
+
+    fd, image_path = tempfile.mkstemp(suffix='.png')
+    os.close(fd)
+    try:
+        Image.fromarray(image).save(image_path)
+        legacy = _time_frames(_legacy_zoom_clip(image_path, args.duration), frame_count, args.fps)
+        vectorized = _time_frames(_zoom_clip(image_path, args.duration, args.fps), frame_count, args.fps)
+    finally:
+        os.remove(image_path)
+
+    print(json.dumps({
+        "frames": frame_count,
+        "size": [args.width, args.height],
+        "legacy_seconds": round(legacy, 3),
+        "vectorized_seconds": round(vectorized, 3),
+        "speedup": round(legacy / vectorized, 1) if vectorized else None
+    }))
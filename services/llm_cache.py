@@ -0,0 +1,101 @@
+import copy
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from services.disk_cache import DiskCache, hash_key
+
+LLM_CACHE_DIR = os.environ.get('LLM_CACHE_DIR', os.path.join('cache', 'llm'))
+LLM_CACHE_MAX_MB = int(os.environ.get('LLM_CACHE_MAX_MB', 100))
+LLM_CACHE_MEMORY_ENTRIES = int(os.environ.get('LLM_CACHE_MEMORY_ENTRIES', 256))
+LLM_CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL_HOURS', 24 * 7)) * 3600
+
+def normalize_text(text):
+    """
+    Normalizes LLM input so trivially different requests
+    ('Photosynthesis ' vs 'photosynthesis') share a cache entry.
+    """
+    return re.sub(r'\s+', ' ', text or '').strip().casefold()
+
+def llm_key(model, text, profile=None, temperature=None):
+    return hash_key(model, normalize_text(text), profile or {}, temperature)
+
+class LLMCache:
+    """
+    Two-tier cache for LLM responses: a small in-process LRU in front of a
+    persistent on-disk store. Entries expire after ttl seconds.
+    """
+
+    def __init__(self, directory, max_bytes, memory_entries, ttl):
+        self.memory = OrderedDict()  # key -> (expires_at, value)
+        self.memory_entries = memory_entries
+        self.disk = DiskCache(directory, max_bytes, name="llm")
+        self.ttl = ttl
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry:
+                expires_at, value = entry
+                if expires_at > now:
+                    self.memory.move_to_end(key)
+                    self.memory_hits += 1
+                    # Callers may mutate what they get back
+                    return copy.deepcopy(value)
+                del self.memory[key]
+
+        path = self.disk.get(key)
+        if path:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                if entry['expires_at'] > now:
+                    self._remember(key, entry['expires_at'], entry['value'])
+                    with self.lock:
+                        self.disk_hits += 1
+                    return entry['value']
+                self.disk.delete(key)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error reading LLM cache entry {key}: {e}")
+                self.disk.delete(key)
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, value)
+        try:
+            data = json.dumps({'expires_at': expires_at, 'value': value})
+            self.disk.put_bytes(key, data.encode('utf-8'))
+        except (OSError, TypeError) as e:
+            print(f"Error writing LLM cache entry {key}: {e}")
+
+    def _remember(self, key, expires_at, value):
+        with self.lock:
+            self.memory[key] = (expires_at, copy.deepcopy(value))
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_entries:
+                self.memory.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            stats = {
+                'memory_entries': len(self.memory),
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'ttl': self.ttl
+            }
+        stats['disk'] = self.disk.stats()
+        return stats
+
+llm_cache = LLMCache(LLM_CACHE_DIR, LLM_CACHE_MAX_MB * 1024 * 1024, LLM_CACHE_MEMORY_ENTRIES, LLM_CACHE_TTL)
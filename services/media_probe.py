@@ -0,0 +1,189 @@
+import os
+import struct
+
+# Reading headers only; nothing here decodes audio or starts a process
+
+# MPEG audio bitrates (kbps) by [version is MPEG-1][layer], index 1-14
+_MP3_BITRATES = {
+    (True, 1): [32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+def _iter_chunks(f, end, header_size=8, little_endian=True):
+    """
+    Yields (chunk id, data offset, data size) for RIFF/IFF style chunks.
+    """
+    fmt = '<4sI' if little_endian else '>4sI'
+    while f.tell() + header_size <= end:
+        chunk_id, size = struct.unpack(fmt, f.read(header_size))
+        offset = f.tell()
+        yield chunk_id, offset, size
+        # Chunks are padded to an even size
+        f.seek(offset + size + (size & 1))
+
+def wav_duration(f, file_size):
+    f.seek(12)
+    byte_rate = None
+    for chunk_id, offset, size in _iter_chunks(f, file_size):
+        if chunk_id == b'fmt ':
+            _, _, _, byte_rate = struct.unpack('<HHII', f.read(12))
+        elif chunk_id == b'data' and byte_rate:
+            # Streamed WAVs may leave the size unset; use what is on disk
+            size = min(size, file_size - offset)
+            return size / float(byte_rate)
+    return None
+
+def _extended_to_float(data):
+    # 80-bit IEEE 754 extended precision, as used for AIFF sample rates
+    exponent, mantissa = struct.unpack('>HQ', data)
+    sign = -1 if exponent & 0x8000 else 1
+    exponent &= 0x7FFF
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return sign * mantissa * 2.0 ** (exponent - 16383 - 63)
+
+def aiff_duration(f, file_size):
+    f.seek(12)
+    for chunk_id, offset, size in _iter_chunks(f, file_size, little_endian=False):
+        if chunk_id == b'COMM':
+            _, frames, _, rate = struct.unpack('>hIh10s', f.read(18))
+            sample_rate = _extended_to_float(rate)
+            return frames / sample_rate if sample_rate else None
+    return None
+
+def _iter_boxes(f, end):
+    """
+    Yields (box type, data offset, data size) for MP4 boxes up to end.
+    """
+    while f.tell() + 8 <= end:
+        start = f.tell()
+        size, box_type = struct.unpack('>I4s', f.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - start
+        if size < header:
+            return
+        yield box_type, start + header, size - header
+        f.seek(start + size)
+
+def mp4_duration(f, file_size):
+    f.seek(0)
+    for box_type, offset, size in _iter_boxes(f, file_size):
+        if box_type != b'moov':
+            continue
+        for child_type, child_offset, _ in _iter_boxes(f, offset + size):
+            if child_type != b'mvhd':
+                continue
+            version = f.read(1)[0]
+            f.read(3)  # flags
+            if version == 1:
+                _, _, timescale, duration = struct.unpack('>QQIQ', f.read(28))
+            else:
+                _, _, timescale, duration = struct.unpack('>IIII', f.read(16))
+            return duration / float(timescale) if timescale else None
+        return None
+    return None
+
+def _mp3_frame_header(data):
+    """
+    Parses a 4-byte MPEG audio frame header.
+    Returns (bitrate bps, sample rate, samples per frame, MPEG-1, mono,
+    frame length in bytes) or None.
+    """
+    if len(data) < 4 or data[0] != 0xFF or (data[1] & 0xE0) != 0xE0:
+        return None
+    version_bits = (data[1] >> 3) & 0x03
+    layer = 4 - ((data[1] >> 1) & 0x03)
+    bitrate_index = data[2] >> 4
+    rate_index = (data[2] >> 2) & 0x03
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version_bits == 3
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index - 1] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version_bits][rate_index]
+    if layer == 1:
+        samples = 384
+    elif layer == 3 and not mpeg1:
+        samples = 576
+    else:
+        samples = 1152
+    mono = (data[3] >> 6) == 3
+    padding = (data[2] >> 1) & 0x01
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        length = samples // 8 * bitrate // sample_rate + padding
+    return bitrate, sample_rate, samples, mpeg1, mono, length
+
+def mp3_duration(f, file_size):
+    f.seek(0)
+    start = 0
+    header = f.read(10)
+    if header[:3] == b'ID3':
+        # Syncsafe tag size, plus the footer if present
+        size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        start = 10 + size + (10 if header[5] & 0x10 else 0)
+
+    # Find the first frame; tags are sometimes followed by padding. A real
+    # frame is followed by another one, which rules out stray sync bytes.
+    f.seek(start)
+    data = f.read(64 * 1024)
+    for i in range(len(data) - 3):
+        frame = _mp3_frame_header(data[i:i + 4])
+        if frame and _mp3_frame_header(data[i + frame[5]:i + frame[5] + 4]):
+            break
+    else:
+        return None
+    start += i
+    bitrate, sample_rate, samples, mpeg1, mono, _ = frame
+
+    # VBR files carry the frame count in a Xing/Info or VBRI header
+    # in the first frame
+    if mpeg1:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    first_frame = data[i:i + 200]
+    xing = first_frame[4 + side_info:4 + side_info + 12]
+    if xing[:4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', xing[4:8])[0]
+        if flags & 0x1:
+            frames = struct.unpack('>I', xing[8:12])[0]
+            return frames * samples / float(sample_rate)
+    vbri = first_frame[36:54]
+    if vbri[:4] == b'VBRI':
+        frames = struct.unpack('>I', vbri[14:18])[0]
+        return frames * samples / float(sample_rate)
+
+    # Constant bitrate: the audio size gives the duration
+    return (file_size - start) * 8 / float(bitrate)
+
+def probe_duration(path):
+    """
+    Returns the duration in seconds of a WAV, AIFF, MP4/M4A or MP3 file,
+    read from its headers. Returns None if the format isn't recognized or
+    the headers are unreadable.
+    """
+    try:
+        file_size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            magic = f.read(12)
+            if magic[:4] == b'RIFF' and magic[8:12] == b'WAVE':
+                return wav_duration(f, file_size)
+            if magic[:4] == b'FORM' and magic[8:12] in (b'AIFF', b'AIFC'):
+                return aiff_duration(f, file_size)
+            if magic[4:8] == b'ftyp':
+                return mp4_duration(f, file_size)
+            return mp3_duration(f, file_size)
+    except (OSError, struct.error, IndexError, ValueError) as e:
+        print(f"Error probing {path}: {e}")
+        return None
@@ -1,7 +1,11 @@
 import os
-import requests
 import base64
 import time
+from services.outbound_scheduler import scheduler
+from services.image_cache import image_key, load_cached_image, store_image
+
+# Name used to look up provider-wide settings (e.g. concurrency caps)
+PROVIDER = "nvidia"
 
 def generate_scene_image(prompt, scene_num, output_dir):
     """
@@ -32,9 +36,15 @@ def generate_scene_image(prompt, scene_num, output_dir):
         "steps": 25
     }
 
+    # Same prompt + payload always gives the same image (fixed seed)
+    cache_key = image_key(PROVIDER, prompt, {"url": invoke_url, "payload": payload})
+    filename = load_cached_image(cache_key, output_dir, f"scene_{scene_num}_{int(time.time())}.jpg")
+    if filename:
+        return filename
+
     try:
         print(f"Generating image with NVIDIA for scene {scene_num}...")
-        response = requests.post(invoke_url, headers=headers, json=payload)
+        response = scheduler.request(PROVIDER, 'POST', invoke_url, headers=headers, json=payload)
         response.raise_for_status()
         
         body = response.json()
@@ -50,6 +60,7 @@ def generate_scene_image(prompt, scene_num, output_dir):
                 with open(filepath, "wb") as f:
                     f.write(base64.b64decode(image_base64))
                 
+                store_image(cache_key, filepath)
                 print(f"Saved NVIDIA image: {filepath}")
                 return filename
             else:
@@ -0,0 +1,203 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import groq
+import requests
+
+from services import http_clients
+
+# Status codes worth retrying: rate limited or a transient server error
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+MAX_RETRIES = int(os.environ.get('OUTBOUND_MAX_RETRIES', 4))
+BASE_DELAY = float(os.environ.get('OUTBOUND_BASE_DELAY', 1.0))
+MAX_DELAY = float(os.environ.get('OUTBOUND_MAX_DELAY', 30.0))
+
+def _limits(prefix, per_minute, burst, concurrency_env, concurrency):
+    return {
+        'per_minute': float(os.environ.get(f'{prefix}_REQUESTS_PER_MINUTE', per_minute)),
+        'burst': int(os.environ.get(f'{prefix}_BURST', burst)),
+        'concurrency': int(os.environ.get(concurrency_env, concurrency)),
+    }
+
+# Sustained request rate, burst size and in-flight cap per provider.
+# A per_minute of 0 disables rate limiting for that provider.
+PROVIDER_LIMITS = {
+    'nvidia': _limits('NVIDIA', 40, 5, 'NVIDIA_IMAGE_CONCURRENCY', 4),
+    'pexels': _limits('PEXELS', 200 / 60, 10, 'PEXELS_IMAGE_CONCURRENCY', 6),
+    'gemini': _limits('GEMINI', 10, 2, 'GEMINI_IMAGE_CONCURRENCY', 2),
+    'local': _limits('LOCAL', 0, 1, 'LOCAL_IMAGE_CONCURRENCY', 1),
+    'groq': _limits('GROQ', 30, 5, 'GROQ_CONCURRENCY', 8),
+}
+# Image downloads from the Pexels CDN don't count against the API quota
+PROVIDER_LIMITS['pexels_cdn'] = {'per_minute': 0, 'burst': 1, 'concurrency': PROVIDER_LIMITS['pexels']['concurrency']}
+DEFAULT_LIMITS = {'per_minute': 0, 'burst': 1, 'concurrency': 2}
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at rate tokens/second up to capacity.
+    acquire() blocks until a token is available.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """
+        Empties the bucket so nobody calls the provider for ~seconds
+        (used when the provider tells us to back off).
+        """
+        if self.rate <= 0:
+            return
+        with self.lock:
+            self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class RetryableStatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"Retryable status {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header (seconds or HTTP date) into seconds.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _status_and_headers(error):
+    """
+    Pulls an HTTP status and headers out of exceptions raised by requests,
+    the Groq SDK or Google's SDK.
+    """
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+    if status is None and isinstance(getattr(error, 'code', None), int):
+        status = error.code
+    headers = getattr(response, 'headers', None) or {}
+    return status, headers
+
+
+def _is_connection_error(error):
+    return isinstance(error, (
+        requests.ConnectionError,
+        requests.Timeout,
+        groq.APIConnectionError,
+    ))
+
+
+class OutboundScheduler:
+    """
+    Central gate for calls to external providers: a token bucket and a
+    concurrency cap per provider, plus retries with jittered exponential
+    backoff that honour Retry-After.
+    """
+    def __init__(self, limits, max_retries=MAX_RETRIES, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+        self.limits = limits
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.buckets = {}
+        self.semaphores = {}
+        self.lock = threading.Lock()
+
+    def get_limits(self, provider):
+        return self.limits.get(provider, DEFAULT_LIMITS)
+
+    def get_concurrency(self, provider):
+        return max(1, self.get_limits(provider)['concurrency'])
+
+    def _get_gates(self, provider):
+        with self.lock:
+            if provider not in self.buckets:
+                limits = self.get_limits(provider)
+                self.buckets[provider] = TokenBucket(limits['per_minute'] / 60.0, limits['burst'])
+                self.semaphores[provider] = threading.BoundedSemaphore(self.get_concurrency(provider))
+            return self.buckets[provider], self.semaphores[provider]
+
+    def _backoff(self, attempt, retry_after=None):
+        # Full jitter, but never sooner than the provider asked for
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay * 4))
+        return delay
+
+    def call(self, provider, fn, *args, **kwargs):
+        """
+        Calls fn(*args, **kwargs) under the provider's rate and concurrency
+        limits. Retries on 429/5xx responses, retryable SDK errors and
+        connection failures. If the last attempt returns a retryable
+        requests.Response it is returned so the caller can report it.
+        """
+        bucket, semaphore = self._get_gates(provider)
+
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            try:
+                with semaphore:
+                    result = fn(*args, **kwargs)
+
+                if isinstance(result, requests.Response) and result.status_code in RETRYABLE_STATUS:
+                    if attempt == self.max_retries:
+                        return result
+                    raise RetryableStatusError(result.status_code, parse_retry_after(result.headers.get('Retry-After')))
+                return result
+
+            except Exception as e:
+                if isinstance(e, RetryableStatusError):
+                    status, retry_after = e.status_code, e.retry_after
+                else:
+                    status, headers = _status_and_headers(e)
+                    retry_after = parse_retry_after(headers.get('Retry-After') if headers else None)
+                    if status not in RETRYABLE_STATUS and not _is_connection_error(e):
+                        raise
+                    if attempt == self.max_retries:
+                        raise
+
+                delay = self._backoff(attempt, retry_after)
+                if status == 429:
+                    bucket.pause(delay)
+                print(f"{provider} call failed ({status or type(e).__name__}), retrying in {delay:.1f}s "
+                      f"(attempt {attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+
+    def request(self, provider, method, url, **kwargs):
+        """
+        HTTP request through the shared connection pools, scheduled for provider.
+        """
+        return self.call(provider, http_clients.request, method, url, **kwargs)
+
+
+scheduler = OutboundScheduler(PROVIDER_LIMITS)
@@ -1,7 +1,10 @@
 import os
-import requests
 import re
 from urllib.parse import urlparse
+from services.outbound_scheduler import scheduler
+from services.image_cache import image_key, load_cached_image, store_image
+
+PROVIDER = "pexels"
 
 def generate_scene_image(prompt, scene_num, output_dir):
     """
@@ -35,12 +38,18 @@ def generate_scene_image(prompt, scene_num, output_dir):
         if len(search_query) < 3:
             search_query = "education"
             
+        # Searches are keyed on the simplified query, since that's all Pexels sees
+        cache_key = image_key(PROVIDER, search_query, {"per_page": 1, "orientation": "landscape", "size": "large"})
+        filename = load_cached_image(cache_key, output_dir, f"scene_{scene_num}.jpg")
+        if filename:
+            return filename
+            
         print(f"Searching Pexels for: '{search_query}' (Original: {prompt[:30]}...)")
         
         headers = {"Authorization": api_key}
         url = f"https://api.pexels.com/v1/search?query={search_query}&per_page=1&orientation=landscape"
         
-        response = requests.get(url, headers=headers)
+        response = scheduler.request(PROVIDER, 'GET', url, headers=headers)
         if response.status_code == 200:
             data = response.json()
             if data['photos']:
@@ -50,7 +59,9 @@ def generate_scene_image(prompt, scene_num, output_dir):
                 print(f"Found image: {image_url}")
                 
                 # Download image
-                img_data = requests.get(image_url).content
+                img_response = scheduler.request('pexels_cdn', 'GET', image_url)
+                img_response.raise_for_status()
+                img_data = img_response.content
                 
                 filename = f"scene_{scene_num}.jpg"
                 filepath = os.path.join(output_dir, filename)
@@ -58,6 +69,7 @@ def generate_scene_image(prompt, scene_num, output_dir):
                 with open(filepath, 'wb') as f:
                     f.write(img_data)
                     
+                store_image(cache_key, filepath)
                 print(f"Saved: {filepath}")
                 return filename
             else:
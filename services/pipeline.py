@@ -0,0 +1,86 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class Stage:
+    """
+    One step of a pipeline. fn is called as fn(results, progress) where
+    results maps each finished stage name to its return value and progress
+    reports the stage's own completed fraction (0.0 - 1.0).
+    """
+    def __init__(self, name, fn, deps=(), weight=1.0):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.weight = weight
+
+
+class Pipeline:
+    """
+    Runs a dependency graph of stages. Each stage starts as soon as all of
+    its dependencies have finished, so independent branches overlap and the
+    total time is the length of the critical path.
+    """
+    def __init__(self, stages, max_workers=4):
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers
+        self.results = {}
+        self.timings = {}
+        self.fractions = {name: 0.0 for name in self.stages}
+        self.lock = threading.Lock()
+
+        for stage in stages:
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+    def run(self, progress_callback=None):
+        """
+        Runs every stage and returns the results dict. If a stage fails, no
+        new stages are started and the exception is re-raised.
+        """
+        pending = dict(self.stages)
+        running = {}
+
+        def report(name, fraction):
+            if not progress_callback:
+                return
+            with self.lock:
+                self.fractions[name] = max(self.fractions[name], min(fraction, 1.0))
+                total_weight = sum(stage.weight for stage in self.stages.values())
+                done = sum(self.stages[n].weight * f for n, f in self.fractions.items())
+            progress_callback(done / total_weight if total_weight else 1.0)
+
+        def execute(stage):
+            started = time.time()
+            print(f"Pipeline stage '{stage.name}' started")
+            with self.lock:
+                inputs = dict(self.results)
+            result = stage.fn(inputs, lambda fraction: report(stage.name, fraction))
+            self.timings[stage.name] = round(time.time() - started, 2)
+            print(f"Pipeline stage '{stage.name}' finished in {self.timings[stage.name]}s")
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline") as executor:
+            while pending or running:
+                # Start every stage whose dependencies are all done
+                for name, stage in list(pending.items()):
+                    if all(dep in self.results for dep in stage.deps):
+                        running[executor.submit(execute, stage)] = name
+                        del pending[name]
+
+                if not running:
+                    raise RuntimeError(f"Pipeline has unsatisfiable stages: {', '.join(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    # Re-raises the stage's exception; the executor then waits
+                    # for stages already running but starts no new ones
+                    result = future.result()
+                    with self.lock:
+                        self.results[name] = result
+                    report(name, 1.0)
+
+        return self.results
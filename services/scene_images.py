@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from services.outbound_scheduler import scheduler
+from services.scene_manifest import record_scene_images
+
+def generate_scene_images(scenes, output_dir, provider_module, scene_count=None):
+    """
+    Generates one image per scene concurrently using provider_module.generate_scene_image.
+    scenes may be a list or any iterable, such as a generator yielding scenes
+    while the LLM is still writing them; each scene is submitted as soon as
+    it is produced.
+    Returns a list of (scene_number, filename) in the same order as scenes;
+    filename is None for scenes that failed. The results are also recorded
+    in the scene manifest of output_dir for the renderer; pass scene_count
+    (the number of scenes in the whole script) when scenes is the full set,
+    so scenes from a longer earlier script are dropped from it.
+    """
+    provider = getattr(provider_module, 'PROVIDER', provider_module.__name__)
+
+    def generate(scene):
+        scene_num = scene.get('scene_number')
+        prompt = scene.get('image_prompt')
+        return scene_num, provider_module.generate_scene_image(prompt, scene_num, output_dir)
+
+    # The scheduler enforces the process-wide cap on in-flight provider
+    # calls; there's no point running more threads than that here
+    max_workers = scheduler.get_concurrency(provider)
+    if isinstance(scenes, (list, tuple)):
+        if not scenes:
+            return []
+        max_workers = min(len(scenes), max_workers)
+
+    print(f"Generating images with {provider} ({max_workers} at a time)...")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{provider}-image") as executor:
+        futures = [executor.submit(generate, scene) for scene in scenes]
+        # Collect in submission order so scene order is kept
+        results = [future.result() for future in futures]
+
+    try:
+        record_scene_images(output_dir, results, scene_count)
+    except Exception as e:
+        print(f"Error writing scene manifest: {e}")
+    return results
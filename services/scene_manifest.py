@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import threading
+
+MANIFEST_NAME = 'manifest.json'
+
+# Serializes read-modify-write of manifests within this process
+_lock = threading.Lock()
+
+def manifest_path(images_dir):
+    return os.path.join(images_dir, MANIFEST_NAME)
+
+def load_manifest(images_dir):
+    """
+    Returns the manifest for images_dir as
+    {'scene_count': n, 'scenes': {scene_number: filename}},
+    or None if there is no readable manifest.
+    """
+    try:
+        with open(manifest_path(images_dir)) as f:
+            data = json.load(f)
+        scenes = {int(num): filename for num, filename in data.get('scenes', {}).items() if filename}
+        return {'scene_count': int(data.get('scene_count', len(scenes))), 'scenes': scenes}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        print(f"Error reading scene manifest in {images_dir}: {e}")
+        return None
+
+def _write_manifest(images_dir, manifest):
+    data = {
+        'scene_count': manifest['scene_count'],
+        'scenes': {str(num): filename for num, filename in sorted(manifest['scenes'].items())}
+    }
+    # Write to a temp file first so readers never see a partial manifest
+    fd, tmp_path = tempfile.mkstemp(dir=images_dir, prefix='.manifest-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, manifest_path(images_dir))
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def record_scene_images(images_dir, results, scene_count=None):
+    """
+    Records the images of a generation run. results is a list of
+    (scene_number, filename); only those scenes are updated, and scenes
+    that failed (filename None) keep their previous image, if any, so
+    regenerating a single scene leaves the others in place.
+    scene_count is the number of scenes in the script, when the caller
+    knows it; scenes left over from a longer earlier run are then dropped.
+    Otherwise the count never shrinks: it is the previous count or the
+    highest scene number recorded, whichever is larger.
+    """
+    with _lock:
+        manifest = load_manifest(images_dir) or {'scene_count': 0, 'scenes': {}}
+        scenes = dict(manifest['scenes'])
+        for scene_num, filename in results:
+            if filename:
+                scenes[int(scene_num)] = filename
+
+        if scene_count is None:
+            scene_count = max([manifest['scene_count']] + list(scenes))
+        else:
+            scenes = {num: filename for num, filename in scenes.items() if num <= scene_count}
+
+        manifest = {'scene_count': scene_count, 'scenes': scenes}
+        _write_manifest(images_dir, manifest)
+        return manifest
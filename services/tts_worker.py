@@ -0,0 +1,190 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+TTS_RATE = int(os.environ.get('TTS_RATE', 150))        # Speed percent (can go over 100)
+TTS_VOLUME = float(os.environ.get('TTS_VOLUME', 0.9))  # Volume 0-1
+# Synthesis processes; each owns one engine and speaks one text at a time
+TTS_WORKERS = int(os.environ.get('TTS_WORKERS', min(4, os.cpu_count() or 1)))
+# Seconds to wait for the engine to start before giving up
+TTS_START_TIMEOUT = float(os.environ.get('TTS_START_TIMEOUT', 60))
+
+def select_voice(engine):
+    """
+    Picks the narration voice. Prefers a female voice if available, often
+    clearer for narration. Returns the id of the voice in use.
+    """
+    for voice in engine.getProperty('voices'):
+        if "female" in voice.name.lower() or "zira" in voice.name.lower():
+            engine.setProperty('voice', voice.id)
+            return voice.id
+    return engine.getProperty('voice')
+
+def _worker_main(requests, responses, rate, volume):
+    """
+    Entry point of a TTS process: starts the engine once, then handles
+    (request_id, text, path) requests one at a time until it gets None.
+    All workers of a pool take requests from the same queue.
+    """
+    try:
+        import pyttsx3
+        engine = pyttsx3.init()
+        engine.setProperty('rate', rate)
+        engine.setProperty('volume', volume)
+        voice_id = select_voice(engine)
+    except Exception as e:
+        responses.put(('failed', None, f"Could not start TTS engine: {e}"))
+        return
+
+    responses.put(('ready', None, voice_id))
+
+    while True:
+        item = requests.get()
+        if item is None:
+            break
+
+        request_id, text, path = item
+        try:
+            # specific to pyttsx3, save_to_file processes the event loop
+            engine.save_to_file(text, path)
+            engine.runAndWait()
+            responses.put(('done', request_id, None))
+        except Exception as e:
+            responses.put(('done', request_id, str(e)))
+
+class TTSWorkerPool:
+    """
+    Long-lived text-to-speech processes. pyttsx3 is slow to start and not
+    safe to use from several threads at once, so each process owns its own
+    engine; all of them work through one shared request queue, and callers
+    get futures back.
+    """
+    def __init__(self, workers=TTS_WORKERS, rate=TTS_RATE, volume=TTS_VOLUME):
+        self.workers = max(1, workers)
+        self.rate = rate
+        self.volume = volume
+        self.voice_id = None
+        self.processes = []
+        self.pending = {}  # request_id -> (Future, output_path, processes it was queued for)
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def is_running(self):
+        return bool(self.processes) and all(process.is_alive() for process in self.processes)
+
+    def start(self):
+        """
+        Starts the worker processes if they aren't running and waits for
+        their engines to be ready. Raises RuntimeError if they fail to start.
+        """
+        with self.lock:
+            if self.is_running():
+                return
+            self._terminate()
+
+            # spawn: forking a multi-threaded Flask process is not safe
+            context = multiprocessing.get_context('spawn')
+            self.requests = context.Queue()
+            self.responses = context.Queue()
+            self.processes = [
+                context.Process(
+                    target=_worker_main,
+                    args=(self.requests, self.responses, self.rate, self.volume),
+                    name=f"tts-worker-{i}",
+                    daemon=True
+                )
+                for i in range(self.workers)
+            ]
+            for process in self.processes:
+                process.start()
+
+            for _ in self.processes:
+                try:
+                    status, _, value = self.responses.get(timeout=TTS_START_TIMEOUT)
+                except queue.Empty:
+                    status, value = 'failed', "TTS engine did not start in time"
+                if status != 'ready':
+                    self._terminate()
+                    raise RuntimeError(value)
+                self.voice_id = value
+
+            print(f"🔊 {self.workers} TTS workers started (voice: {self.voice_id})")
+
+            self.dispatcher = threading.Thread(
+                target=self._dispatch, args=(self.processes, self.responses), daemon=True
+            )
+            self.dispatcher.start()
+
+    def stop(self):
+        with self.lock:
+            if not self.processes:
+                return
+            for _ in self.processes:
+                self.requests.put(None)
+            for process in self.processes:
+                process.join(timeout=5)
+            self._terminate()
+        print("🔊 TTS workers stopped.")
+
+    def _terminate(self):
+        # Caller holds the lock
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+
+    def synthesize(self, text, output_path):
+        """
+        Queues text to be spoken into output_path by the next free worker.
+        Returns a Future that resolves to output_path.
+        """
+        self.start()
+
+        future = Future()
+        with self.lock:
+            if not self.processes:
+                raise RuntimeError("TTS workers are not running")
+            request_id = next(self.ids)
+            self.pending[request_id] = (future, output_path, self.processes)
+            self.requests.put((request_id, text, output_path))
+        return future
+
+    def _dispatch(self, processes, responses):
+        """
+        Resolves futures as the workers report results. Requests are not
+        tied to a worker, so if any worker dies the whole pool is torn down
+        and everything still waiting fails instead of hanging; the next
+        request starts a fresh pool.
+        """
+        while True:
+            try:
+                status, request_id, error = responses.get(timeout=1)
+            except queue.Empty:
+                if all(process.is_alive() for process in processes):
+                    continue
+                break
+
+            with self.lock:
+                entry = self.pending.pop(request_id, None)
+            if entry is None:
+                continue
+            future, output_path, _ = entry
+            if error:
+                future.set_exception(RuntimeError(error))
+            else:
+                future.set_result(output_path)
+
+        with self.lock:
+            if self.processes is processes:
+                self._terminate()
+            # A newer pool may already be running; its requests aren't ours
+            failed = [request_id for request_id, entry in self.pending.items() if entry[2] is processes]
+            failed = [self.pending.pop(request_id)[0] for request_id in failed]
+        for future in failed:
+            future.set_exception(RuntimeError("TTS worker exited"))
+
+# Shared by all requests; the processes are started on first use
+tts_pool = TTSWorkerPool()
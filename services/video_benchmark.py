@@ -0,0 +1,224 @@
+"""
+Rendering benchmark with synthetic inputs.
+
+Renders generated scene images over silent narration with every backend and
+render profile and prints one JSON object per run, e.g.
+
+    python -m services.video_benchmark --scenes 3 6 12 --duration 60
+
+Each run happens in a fresh process with empty caches, so the numbers are
+cold-render costs and the peak RSS of one run doesn't leak into the next.
+realtime_factor is wall time divided by video length (below 1 is faster
+than real time). CPU time and peak RSS of the ffmpeg processes a backend
+spawns are reported separately as child_*. Peak RSS needs the Unix-only
+resource module and child CPU time isn't tracked on Windows; values that
+can't be measured are reported as null.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import sys
+import tempfile
+import time
+import wave
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+from PIL import Image, ImageDraw
+
+from services.scene_manifest import record_scene_images
+
+# ru_maxrss is in kilobytes on Linux and bytes on macOS
+RSS_DIVISOR = 1024 * 1024 if sys.platform == 'darwin' else 1024
+
+def make_scene_images(images_dir, count, size):
+    """
+    Writes count flat-design style slides (shapes on white) and a scene
+    manifest for them, like image generation would.
+    """
+    os.makedirs(images_dir, exist_ok=True)
+    width, height = size
+    results = []
+    for scene_num in range(1, count + 1):
+        rng = random.Random(scene_num)
+        image = Image.new('RGB', size, 'white')
+        draw = ImageDraw.Draw(image)
+        for _ in range(12):
+            x0, y0 = rng.randrange(width), rng.randrange(height)
+            x1, y1 = x0 + rng.randrange(20, width // 3), y0 + rng.randrange(20, height // 3)
+            color = tuple(rng.randrange(256) for _ in range(3))
+            if rng.random() < 0.5:
+                draw.rectangle([x0, y0, x1, y1], fill=color, outline='black', width=3)
+            else:
+                draw.ellipse([x0, y0, x1, y1], fill=color, outline='black', width=3)
+        draw.text((20, 20), f"Scene {scene_num}", fill='black')
+
+        filename = f"scene_{scene_num}.png"
+        image.save(os.path.join(images_dir, filename))
+        results.append((scene_num, filename))
+
+    record_scene_images(images_dir, results, count)
+
+def make_silent_wav(path, seconds, sample_rate=22050):
+    """
+    Writes seconds of 16-bit mono silence.
+    """
+    second = b'\x00\x00' * sample_rate
+    remaining = int(seconds * sample_rate)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        while remaining > 0:
+            frames = min(remaining, sample_rate)
+            wav.writeframes(second[:frames * 2])
+            remaining -= frames
+
+def peak_rss_mb(who):
+    """
+    Peak RSS in MB of 'RUSAGE_SELF' or 'RUSAGE_CHILDREN', or None where
+    resource isn't available.
+    """
+    if resource is None:
+        return None
+    return round(resource.getrusage(getattr(resource, who)).ru_maxrss / RSS_DIVISOR, 1)
+
+def run_case(case, results):
+    """
+    Runs one render in this (fresh) process and puts its measurements on
+    the results queue.
+    """
+    # Cold caches for every run, set before the video modules create them
+    os.environ['SEGMENT_CACHE_DIR'] = os.path.join(case['work_dir'], 'cache', 'segments')
+    os.environ['NORMALIZED_CACHE_DIR'] = os.path.join(case['work_dir'], 'cache', 'normalized')
+    # Keep stdout for the JSON records
+    sys.stdout = sys.stderr
+
+    from services import video_generator
+
+    output_path = os.path.join(case['work_dir'], 'output.mp4')
+    start_times = os.times()
+    start = time.perf_counter()
+    ok = video_generator.create_video(
+        case['images_dir'],
+        case['audio_path'],
+        output_path,
+        temp_dir=os.path.join(case['work_dir'], 'temp'),
+        backend=case['backend'],
+        profile=case['profile']
+    )
+    wall = time.perf_counter() - start
+    end_times = os.times()
+
+    # os.times() always reports 0 for children on Windows
+    child_cpu = None
+    if sys.platform != 'win32':
+        child_cpu = round(
+            (end_times.children_user - start_times.children_user) +
+            (end_times.children_system - start_times.children_system), 3
+        )
+
+    results.put({
+        'ok': ok,
+        'wall_seconds': round(wall, 3),
+        'cpu_seconds': round((end_times.user - start_times.user) + (end_times.system - start_times.system), 3),
+        'child_cpu_seconds': child_cpu,
+        'peak_rss_mb': peak_rss_mb('RUSAGE_SELF'),
+        'child_peak_rss_mb': peak_rss_mb('RUSAGE_CHILDREN'),
+        'output_bytes': os.path.getsize(output_path) if ok and os.path.exists(output_path) else None,
+    })
+
+def benchmark(case):
+    """
+    Runs case in a separate process and returns its record.
+    """
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=run_case, args=(case, results))
+    process.start()
+    process.join()
+
+    record = {
+        'backend': case['backend'],
+        'profile': case['profile'],
+        'scenes': case['scenes'],
+        'image_size': list(case['image_size']),
+        'video_seconds': case['duration'],
+    }
+    try:
+        record.update(results.get(timeout=5))
+    except queue.Empty:
+        record.update({'ok': False, 'error': f"benchmark process exited with {process.exitcode}"})
+        return record
+
+    if record['ok']:
+        record['realtime_factor'] = round(record['wall_seconds'] / case['duration'], 3)
+    return record
+
+def parse_size(value):
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+        return width, height
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {value}")
+
+def main():
+    from services.video_generator import BACKENDS, RENDER_PROFILES
+
+    parser = argparse.ArgumentParser(description="Benchmark video rendering with synthetic inputs")
+    parser.add_argument("--scenes", type=int, nargs="+", default=[5], help="scene counts to test")
+    parser.add_argument("--sizes", type=parse_size, nargs="+", default=[(1024, 1024)],
+                        help="source image sizes, e.g. 1024x1024 1920x1080")
+    parser.add_argument("--duration", type=float, default=30.0, help="narration length in seconds")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--profiles", nargs="+", choices=list(RENDER_PROFILES), default=list(RENDER_PROFILES))
+    parser.add_argument("--output", help="append JSON lines to this file instead of stdout")
+    parser.add_argument("--keep", action="store_true", help="keep the working directory")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="video-benchmark-")
+    out = open(args.output, 'a') if args.output else sys.stdout
+    try:
+        audio_path = os.path.join(root, 'narration.wav')
+        make_silent_wav(audio_path, args.duration)
+
+        for size in args.sizes:
+            for scenes in args.scenes:
+                images_dir = os.path.join(root, f"images_{scenes}_{size[0]}x{size[1]}")
+                make_scene_images(images_dir, scenes, size)
+
+                for backend in args.backends:
+                    for profile in args.profiles:
+                        work_dir = tempfile.mkdtemp(prefix=f"{backend}-{profile}-", dir=root)
+                        record = benchmark({
+                            'backend': backend,
+                            'profile': profile,
+                            'scenes': scenes,
+                            'image_size': size,
+                            'duration': args.duration,
+                            'images_dir': images_dir,
+                            'audio_path': audio_path,
+                            'work_dir': work_dir,
+                        })
+                        out.write(json.dumps(record) + "\n")
+                        out.flush()
+                        if not args.keep:
+                            shutil.rmtree(work_dir, ignore_errors=True)
+    finally:
+        if args.output:
+            out.close()
+        if args.keep:
+            print(f"Benchmark files kept in {root}", file=sys.stderr)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -1,102 +1,523 @@
 import os
-from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from moviepy.editor import ImageClip, concatenate_videoclips
+from PIL import Image
+from proglog import ProgressBarLogger
+from services.ken_burns import ken_burns_clip, ZOOM_RATE
+from services.ffmpeg_tools import run_ffmpeg, even, audio_codec_args
+from services.disk_cache import DiskCache, hash_file, hash_key
+from services.image_normalizer import normalize_images, FIT_MODE
+from services.scene_manifest import load_manifest
+from services.audio_generator import load_narration_metadata
+from services.media_probe import probe_duration
 
-def create_video(images_dir, audio_path, output_path, scene_count):
+BACKENDS = ("moviepy", "ffmpeg", "segments")
+
+# "hls" writes a playlist plus short segments as the render progresses, so
+# playback can start before the whole video is encoded
+OUTPUT_FORMATS = ("mp4", "hls")
+HLS_SEGMENT_SECONDS = int(os.environ.get('HLS_SEGMENT_SECONDS', 4))
+
+# Encoding presets selectable per render. height=None keeps the size of the
+# scene images; zoom=False skips the Ken Burns effect entirely.
+RENDER_PROFILES = {
+    # Quick preview while iterating on a script
+    'draft': {'height': 480, 'fps': 12, 'preset': 'ultrafast', 'crf': 30, 'zoom': False},
+    'final': {'height': None, 'fps': 24, 'preset': 'medium', 'crf': 23, 'zoom': True},
+}
+DEFAULT_PROFILE = 'final'
+
+# Parallel scene encoders for the "segments" backend
+SEGMENT_WORKERS = int(os.environ.get('VIDEO_SEGMENT_WORKERS', os.cpu_count() or 2))
+
+SEGMENT_CACHE_DIR = os.environ.get('SEGMENT_CACHE_DIR', os.path.join('cache', 'segments'))
+SEGMENT_CACHE_MAX_MB = int(os.environ.get('SEGMENT_CACHE_MAX_MB', 2048))
+
+# Encoded scene segments, reused when a scene's inputs haven't changed
+segment_cache = DiskCache(SEGMENT_CACHE_DIR, SEGMENT_CACHE_MAX_MB * 1024 * 1024, name="segments")
+
+# Share of the progress bar reserved for loading assets before encoding starts
+LOAD_PROGRESS = 0.1
+
+class RenderProgressLogger(ProgressBarLogger):
+    """
+    Proglog logger that forwards moviepy's frame progress to a callback.
+    """
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        # 't' is the frame bar used by write_videofile
+        if bar == 't' and attr == 'index':
+            total = self.bars[bar].get('total')
+            if total:
+                self.callback(LOAD_PROGRESS + (1 - LOAD_PROGRESS) * value / total)
+
+def segment_codec_args(settings):
+    """
+    Every segment of a render is encoded with exactly these settings so the
+    concat demuxer can join them with a stream copy.
+    """
+    return [
+        '-c:v', 'libx264',
+        '-preset', settings['preset'],
+        '-crf', settings['crf'],
+        '-pix_fmt', 'yuv420p',
+        '-r', settings['fps'],
+        '-video_track_timescale', 90000,
+    ]
+
+def find_scene_image(images_dir, scene_num):
+    """
+    Returns the path of the most recent image for a scene, or None.
+    Only used for image directories without a scene manifest.
+    """
+    candidates = []
+    
+    # search for files starting with scene_{i}_ or scene_{i}.
+    prefix_timestamp = f"scene_{scene_num}_"
+    prefix_exact = f"scene_{scene_num}."
+    
+    try:
+        for fname in os.listdir(images_dir):
+            if (fname.startswith(prefix_timestamp) or fname.startswith(prefix_exact)) and \
+               fname.lower().endswith(('.jpg', '.jpeg', '.png')):
+                candidates.append(os.path.join(images_dir, fname))
+        
+        # Sort by modification time (newest first) to get the latest generation
+        if candidates:
+            candidates.sort(key=os.path.getmtime, reverse=True)
+            return candidates[0]
+    except Exception as e:
+        print(f"Error searching for images: {e}")
+    
+    return None
+
+def find_scene_images(images_dir, scene_count=None):
+    """
+    Returns (scene_count, [(scene_number, image path) per scene that has one]).
+    The scene manifest written by image generation is authoritative; a
+    scene_count that disagrees with it is ignored. Directories without a
+    manifest fall back to scanning for scene_{n} files, which needs
+    scene_count.
+    """
+    manifest = load_manifest(images_dir)
+    if manifest is not None:
+        if scene_count and scene_count != manifest['scene_count']:
+            print(f"Warning: requested {scene_count} scenes, manifest has {manifest['scene_count']}")
+        scene_count = manifest['scene_count']
+    elif not scene_count:
+        raise ValueError("No scene manifest found and no scene count given")
+    else:
+        print(f"No scene manifest in {images_dir}, scanning the directory")
+    
+    scene_images = []
+    for i in range(1, scene_count + 1):
+        if manifest is not None:
+            filename = manifest['scenes'].get(i)
+            found_img = os.path.join(images_dir, filename) if filename else None
+        else:
+            found_img = find_scene_image(images_dir, i)
+        
+        if found_img and os.path.exists(found_img):
+            print(f"Using image for scene {i}: {os.path.basename(found_img)}")
+            scene_images.append((i, found_img))
+        else:
+            print(f"Warning: Image for scene {i} not found")
+    
+    return scene_count, scene_images
+
+def get_scene_durations(audio_path, total_duration, scene_count):
+    """
+    Returns how long each scene is shown. Uses the per-scene timings saved
+    with the narration when they match the scenes, so every image stays on
+    screen exactly while its part of the script is spoken; otherwise the
+    narration is split equally.
+    """
+    metadata = load_narration_metadata(audio_path)
+    if metadata and len(metadata.get('scenes', [])) == scene_count:
+        durations = [scene['duration'] for scene in metadata['scenes']]
+        measured = sum(durations)
+        if measured > 0:
+            # Absorb rounding and resampling differences against the real track
+            return [duration * total_duration / measured for duration in durations]
+    elif metadata:
+        print(f"Narration has {len(metadata.get('scenes', []))} scenes, video has {scene_count}; splitting equally")
+    
+    return [total_duration / scene_count] * scene_count
+
+def build_timeline(scene_images, durations):
+    """
+    Pairs each found image with its duration. A scene without an image
+    keeps the previous image on screen (the next one, for leading scenes)
+    so the rest of the video stays in sync with the narration.
+    Returns (image paths, durations).
+    """
+    images = dict(scene_images)
+    paths = []
+    timeline = []
+    carried = 0.0
+    for scene_num, duration in enumerate(durations, start=1):
+        if scene_num in images:
+            paths.append(images[scene_num])
+            timeline.append(duration + carried)
+            carried = 0.0
+        elif timeline:
+            timeline[-1] += duration
+        else:
+            carried += duration
+    return paths, timeline
+
+def create_video(images_dir, audio_path, output_path, scene_count=None, progress_callback=None, temp_dir=None,
+                 backend="moviepy", profile=DEFAULT_PROFILE, fit_mode=FIT_MODE, output_format="mp4"):
     """
     Combines images and audio into a final video.
+    progress_callback, if given, is called with the completed fraction (0.0 - 1.0).
+    Temporary files go to temp_dir (defaults to the output directory) so
+    concurrent renders never share them.
+    backend is one of BACKENDS: "moviepy" composites frames in Python,
+    "ffmpeg" renders everything in a single ffmpeg filtergraph, "segments"
+    encodes each scene in parallel and joins them with a stream copy.
+    profile names one of RENDER_PROFILES ("draft" for a fast preview).
+    Scene images are first converted to the output canvas (letterboxed or
+    cropped, see fit_mode) so every backend only sees uniform frames.
+    With output_format "hls", output_path is the playlist to write; only the
+    ffmpeg backend encodes scenes in order, so it is always used for HLS.
     """
     try:
         print("Starting video creation...")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown rendering backend: {backend}")
+        if profile not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile: {profile}")
+        settings = RENDER_PROFILES[profile]
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        if output_format == "hls" and backend != "ffmpeg":
+            print(f"HLS output is rendered with the ffmpeg backend instead of '{backend}'")
+            backend = "ffmpeg"
+        if progress_callback:
+            progress_callback(0.0)
         
-        # Load audio to get duration
-        audio_clip = AudioFileClip(audio_path)
-        total_duration = audio_clip.duration
-        
-        # Calculate duration per image
-        # In a real app, we might want timing per scene, but for MVP we split equally
+        scene_count, scene_images = find_scene_images(images_dir, scene_count)
         if scene_count == 0:
             raise ValueError("Scene count is zero")
+        if not scene_images:
+            raise ValueError("No images found to create video")
+        
+        # Read the narration length from its headers; no need to decode it
+        total_duration = probe_duration(audio_path)
+        if not total_duration or total_duration <= 0:
+            raise ValueError(f"Could not read the duration of {audio_path}")
+        
+        # Calculate how long each image is shown
+        durations = get_scene_durations(audio_path, total_duration, scene_count)
+        scene_images, durations = build_timeline(scene_images, durations)
+        print(f"Total duration: {total_duration}s, Scenes: {scene_count}, "
+              f"Durations: {', '.join(f'{d:.1f}s' for d in durations)}")
+        
+        if temp_dir is None:
+            temp_dir = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(temp_dir, exist_ok=True)
+        
+        canvas_size = get_canvas(scene_images, settings)
+        normalized_dir = os.path.join(temp_dir, f"normalized_{uuid.uuid4().hex}")
+        
+        try:
+            print(f"Normalizing {len(scene_images)} images to {canvas_size[0]}x{canvas_size[1]} ({fit_mode})...")
+            frames = normalize_images(scene_images, canvas_size, normalized_dir, fit_mode)
             
-        duration_per_scene = total_duration / scene_count
-        print(f"Total duration: {total_duration}s, Scenes: {scene_count}, Duration/scene: {duration_per_scene}s")
-        
-        image_clips = []
-        for i in range(1, scene_count + 1):
-            # Check for various image formats
-            found_img = None
-            # Find the most recent image for this scene
-            found_img = None
-            candidates = []
-            
-            # search for files starting with scene_{i}_ or scene_{i}.
-            prefix_timestamp = f"scene_{i}_"
-            prefix_exact = f"scene_{i}."
-            
-            try:
-                for fname in os.listdir(images_dir):
-                    if (fname.startswith(prefix_timestamp) or fname.startswith(prefix_exact)) and \
-                       fname.lower().endswith(('.jpg', '.jpeg', '.png')):
-                        candidates.append(os.path.join(images_dir, fname))
-                
-                # Sort by modification time (newest first) to get the latest generation
-                if candidates:
-                    candidates.sort(key=os.path.getmtime, reverse=True)
-                    found_img = candidates[0]
-                    print(f"Using image for scene {i}: {os.path.basename(found_img)}")
-            except Exception as e:
-                print(f"Error searching for images: {e}")
-            
-            if found_img:
-                # Create basic clip
-                clip = ImageClip(found_img).set_duration(duration_per_scene)
-                
-                # Apply Ken Burns effect (Zoom In)
-                # Zoom from 100% to 110% over the duration
-                try:
-                    # Center cropping to maintain aspect ratio while zooming
-                    # We simply resize the clip to be slightly larger over time
-                    # and keep it centered (default behavior of resize)
-                    clip = clip.resize(lambda t: 1 + 0.04 * t)
-                    
-                    # Alternatively, for better quality but slower:
-                    # w, h = clip.size
-                    # clip = clip.crop(x1=lambda t: int(w*0.02*t),
-                    #                  y1=lambda t: int(h*0.02*t),
-                    #                  width=lambda t: int(w*(1-0.04*t)),
-                    #                  height=lambda t: int(h*(1-0.04*t)))
-                    # But resize is often smoother for simple implementation
-                except Exception as e:
-                    print(f"Failed to apply zoom effect to scene {i}: {e}")
-                
-                image_clips.append(clip)
+            print(f"Rendering with backend '{backend}', profile '{profile}'")
+            if backend == "ffmpeg":
+                render_with_ffmpeg(frames, durations, audio_path, total_duration, output_path, settings, progress_callback, output_format)
+            elif backend == "segments":
+                render_with_segments(frames, durations, audio_path, total_duration, output_path, temp_dir, settings, progress_callback)
             else:
-                print(f"Warning: Image for scene {i} not found (checked jpg, jpeg, png)")
+                render_with_moviepy(frames, durations, audio_path, total_duration, output_path, temp_dir, settings, progress_callback)
+        finally:
+            shutil.rmtree(normalized_dir, ignore_errors=True)
         
-        if not image_clips:
-            raise ValueError("No images found to create video")
-            
-        print("Concatenating video clips...")
-        # Use overlap for smoother transitions if desired, but simple concat for now
-        final_video = concatenate_videoclips(image_clips, method="compose")
+        if progress_callback:
+            progress_callback(1.0)
         
-        print("Setting audio...")
-        final_video = final_video.set_audio(audio_clip)
+        return True
         
-        # Ensure the video is the exact length of the audio/slides
-        final_video = final_video.set_duration(total_duration)
+    except Exception as e:
+        print(f"Error creating video: {e}")
+        return False
+
+def render_with_moviepy(scene_images, scene_durations, audio_path, total_duration, output_path, temp_dir, settings, progress_callback=None):
+    """
+    Composites the frames in Python and encodes them video-only; the
+    narration is then muxed in by ffmpeg, copied when it is already AAC,
+    so moviepy never decodes and re-encodes it through a temp file.
+    """
+    image_clips = []
+    for i, image_path in enumerate(scene_images):
+        clip = None
+        if settings['zoom']:
+            # Apply Ken Burns effect (Zoom In), centred and cropped to the
+            # image size. Frames come from a precomputed affine warp
+            # schedule rather than a per-frame resize.
+            try:
+                clip = ken_burns_clip(image_path, scene_durations[i], settings['fps'])
+            except Exception as e:
+                print(f"Failed to apply zoom effect to scene {i + 1}: {e}")
         
-        print(f"Writing video file to {output_path}...")
+        if clip is None:
+            clip = ImageClip(image_path).set_duration(scene_durations[i])
+        
+        image_clips.append(clip)
+        
+    print("Concatenating video clips...")
+    # Frames are already uniform, so a plain chain needs no per-frame compositing
+    final_video = concatenate_videoclips(image_clips, method="chain")
+    
+    # Ensure the video is the exact length of the audio/slides
+    final_video = final_video.set_duration(total_duration)
+    
+    if progress_callback:
+        progress_callback(LOAD_PROGRESS)
+    
+    video_path = os.path.join(temp_dir, f"video_{uuid.uuid4().hex}.mp4")
+    try:
+        print(f"Writing video stream to {video_path}...")
         final_video.write_videofile(
-            output_path, 
-            fps=24, 
+            video_path, 
+            fps=settings['fps'], 
             codec='libx264', 
-            audio_codec='aac',
-            temp_audiofile='temp-audio.m4a',
-            remove_temp=True
+            preset=settings['preset'],
+            ffmpeg_params=['-crf', str(settings['crf'])],
+            audio=False,
+            logger=RenderProgressLogger(progress_callback) if progress_callback else 'bar'
         )
         
-        return True
+        print(f"Muxing narration into {output_path}...")
+        mux_audio(video_path, audio_path, total_duration, output_path)
+    finally:
+        if os.path.exists(video_path):
+            os.remove(video_path)
+
+def mux_audio(video_path, audio_path, total_duration, output_path):
+    """
+    Combines an encoded video stream with the narration without
+    re-encoding the video.
+    """
+    run_ffmpeg([
+        '-i', video_path,
+        '-i', audio_path,
+        '-map', '0:v', '-map', '1:a',
+        '-c:v', 'copy',
+        *audio_codec_args(audio_path),
+        '-movflags', '+faststart',
+        '-t', f"{total_duration:.3f}",
+        output_path
+    ])
+
+def scene_filter(input_index, canvas_size, duration, output_label, settings):
+    """
+    Filter chain for one normalized still image: the Ken Burns zoom, if the
+    profile has it, at the canvas size.
+    """
+    width, height = canvas_size
+    fps = settings['fps']
+    zoom_filter = ""
+    if settings['zoom']:
+        zoom_filter = (
+            f"zoompan=z='1+{ZOOM_RATE}*on/{fps}':x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
+            f":d=1:s={width}x{height}:fps={fps},"
+        )
+    return (
+        f"[{input_index}:v]{zoom_filter}setsar=1,"
+        f"trim=duration={duration:.3f}"
+        f"[{output_label}]"
+    )
+
+def get_canvas(scene_images, settings):
+    """
+    Returns the output canvas size. It fits the largest image, like compose
+    did, scaled down to the profile's height if it has one, and rounded to
+    even dimensions for yuv420p.
+    """
+    sizes = []
+    for image_path in scene_images:
+        with Image.open(image_path) as img:
+            sizes.append(img.size)
+    
+    max_w = max(w for w, _ in sizes)
+    max_h = max(h for _, h in sizes)
+    scale = 1.0
+    if settings['height'] and settings['height'] < max_h:
+        scale = settings['height'] / max_h
+    
+    return (even(max_w * scale), even(max_h * scale))
+
+def hls_output_args(playlist_path):
+    """
+    Output options for an HLS event playlist whose segments are listed as
+    soon as each one is written. Keyframes are forced on segment
+    boundaries so every segment starts cleanly.
+    """
+    segment_pattern = os.path.join(os.path.dirname(playlist_path), 'segment_%04d.ts')
+    return [
+        '-force_key_frames', f"expr:gte(t,n_forced*{HLS_SEGMENT_SECONDS})",
+        '-f', 'hls',
+        '-hls_time', HLS_SEGMENT_SECONDS,
+        '-hls_playlist_type', 'event',
+        '-hls_segment_filename', segment_pattern,
+    ]
+
+def render_with_ffmpeg(scene_images, scene_durations, audio_path, total_duration, output_path, settings, progress_callback=None, output_format="mp4"):
+    """
+    Renders the slideshow as a single ffmpeg process: every scene image is
+    an input, one filtergraph zooms and concatenates them, and the
+    narration is muxed in the same pass. Scenes are encoded in order, so
+    HLS segments become playable while later scenes are still rendering.
+    """
+    canvas_size = get_canvas(scene_images, settings)
+    
+    args = []
+    filters = []
+    for i, image_path in enumerate(scene_images):
+        args += ['-loop', '1', '-framerate', settings['fps'], '-t', f"{scene_durations[i]:.3f}", '-i', image_path]
+        filters.append(scene_filter(i, canvas_size, scene_durations[i], f"v{i}", settings))
+    
+    labels = ''.join(f"[v{i}]" for i in range(len(scene_images)))
+    filters.append(f"{labels}concat=n={len(scene_images)}:v=1:a=0,format=yuv420p[vout]")
+    
+    audio_index = len(scene_images)
+    args += ['-i', audio_path]
+    args += [
+        '-filter_complex', ';'.join(filters),
+        '-map', '[vout]', '-map', f"{audio_index}:a",
+        '-c:v', 'libx264', '-preset', settings['preset'], '-crf', settings['crf'], '-r', settings['fps'],
+        *audio_codec_args(audio_path),
+        '-t', f"{total_duration:.3f}",
+    ]
+    if output_format == "hls":
+        args += hls_output_args(output_path)
+    else:
+        args += ['-movflags', '+faststart']
+    args.append(output_path)
+    
+    if progress_callback:
+        progress_callback(LOAD_PROGRESS)
+    
+    print(f"Rendering {len(scene_images)} scenes with ffmpeg to {output_path}...")
+    run_ffmpeg(
+        args,
+        duration=total_duration,
+        progress_callback=(lambda f: progress_callback(LOAD_PROGRESS + (1 - LOAD_PROGRESS) * f)) if progress_callback else None
+    )
+
+def segment_filter(canvas_size, duration, settings):
+    return scene_filter(0, canvas_size, duration, "scene", settings) + ";[scene]format=yuv420p[vout]"
+
+def segment_key(image_path, canvas_size, duration, settings):
+    """
+    Cache key for an encoded segment: image content plus everything that
+    affects the encoded output (duration, zoom, layout and encoder settings).
+    """
+    return hash_key(
+        'segment',
+        hash_file(image_path),
+        segment_filter(canvas_size, duration, settings),
+        [str(arg) for arg in segment_codec_args(settings)]
+    )
+
+def render_segment(image_path, canvas_size, duration, output_path, settings, threads):
+    """
+    Encodes a single scene (video only) with segment_codec_args, reusing a
+    cached segment when the same scene was encoded before.
+    Returns (output_path, whether it came from the cache).
+    """
+    key = segment_key(image_path, canvas_size, duration, settings)
+    if segment_cache.copy_to(key, output_path):
+        return output_path, True
+    
+    filters = segment_filter(canvas_size, duration, settings)
+    run_ffmpeg([
+        '-loop', '1', '-framerate', settings['fps'], '-t', f"{duration:.3f}", '-i', image_path,
+        '-filter_complex', filters,
+        '-map', '[vout]', '-an',
+        *segment_codec_args(settings),
+        '-threads', threads,
+        output_path
+    ])
+    
+    try:
+        segment_cache.put_file(key, output_path)
+    except OSError as e:
+        print(f"Error caching segment {output_path}: {e}")
+    return output_path, False
+
+def concat_segments(segment_paths, audio_path, total_duration, output_path, work_dir):
+    """
+    Joins encoded segments with the concat demuxer (stream copy, no
+    re-encode) and muxes the narration in once.
+    """
+    list_path = os.path.join(work_dir, 'segments.txt')
+    with open(list_path, 'w') as f:
+        for path in segment_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    
+    run_ffmpeg([
+        '-f', 'concat', '-safe', '0', '-i', list_path,
+        '-i', audio_path,
+        '-map', '0:v', '-map', '1:a',
+        '-c:v', 'copy',
+        *audio_codec_args(audio_path),
+        '-movflags', '+faststart',
+        '-t', f"{total_duration:.3f}",
+        output_path
+    ])
+
+def render_with_segments(scene_images, scene_durations, audio_path, total_duration, output_path, temp_dir, settings, progress_callback=None):
+    """
+    Encodes every scene as its own segment in parallel ffmpeg processes,
+    then stream-copies them into the final file. Encoding scales with the
+    number of cores instead of being limited to one libx264 instance, and
+    scenes whose inputs are unchanged are taken from the segment cache.
+    """
+    canvas_size = get_canvas(scene_images, settings)
+    
+    work_dir = os.path.join(temp_dir, f"segments_{uuid.uuid4().hex}")
+    os.makedirs(work_dir, exist_ok=True)
+    
+    workers = max(1, min(SEGMENT_WORKERS, len(scene_images)))
+    # Split the cores between encoders rather than oversubscribing them
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    
+    if progress_callback:
+        progress_callback(LOAD_PROGRESS)
+    
+    try:
+        print(f"Encoding {len(scene_images)} segments with {workers} workers...")
+        # Each task is its own ffmpeg process, so threads are enough to drive them
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segment") as executor:
+            futures = []
+            for i, image_path in enumerate(scene_images):
+                segment_path = os.path.join(work_dir, f"segment_{i:03d}.mp4")
+                futures.append(executor.submit(
+                    render_segment, image_path, canvas_size, scene_durations[i], segment_path, settings, threads
+                ))
+            
+            segment_paths = []
+            reused = 0
+            for future in futures:
+                segment_path, cached = future.result()
+                segment_paths.append(segment_path)
+                reused += cached
+                if progress_callback:
+                    progress_callback(LOAD_PROGRESS + 0.8 * len(segment_paths) / len(futures))
         
-    except Exception as e:
-        print(f"Error creating video: {e}")
-        return False
+        print(f"Reused {reused} of {len(segment_paths)} segments from cache")
+        print(f"Joining segments into {output_path}...")
+        concat_segments(segment_paths, audio_path, total_duration, output_path, work_dir)
+        
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,78 @@
+import os
+import re
+import shutil
+import time
+import uuid
+
+WORKSPACE_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# Workspaces untouched for longer than this are removed when new ones are created
+WORKSPACE_TTL = int(os.environ.get('WORKSPACE_TTL_HOURS', 24)) * 3600
+
+class Workspace:
+    """
+    Job-scoped directory tree holding everything one generation run produces.
+    Concurrent runs each get their own workspace so they never share files.
+    """
+    def __init__(self, workspace_id, root):
+        self.id = workspace_id
+        self.path = os.path.join(root, workspace_id)
+        self.images_dir = os.path.join(self.path, 'images')
+        self.audio_dir = os.path.join(self.path, 'audio')
+        self.video_dir = os.path.join(self.path, 'video')
+        self.temp_dir = os.path.join(self.path, 'temp')
+
+    def ensure_dirs(self):
+        for folder in [self.images_dir, self.audio_dir, self.video_dir, self.temp_dir]:
+            os.makedirs(folder, exist_ok=True)
+
+    def touch(self):
+        os.utime(self.path, None)
+
+    def url_for(self, path):
+        """
+        Returns the URL for a file inside the workspace.
+        Assumes the workspace root lives under the Flask static folder.
+        """
+        return '/' + os.path.relpath(path).replace(os.sep, '/')
+
+def create_workspace(root):
+    purge_old_workspaces(root)
+
+    workspace = Workspace(uuid.uuid4().hex, root)
+    workspace.ensure_dirs()
+    print(f"Created workspace {workspace.id}")
+    return workspace
+
+def get_workspace(workspace_id, root):
+    """
+    Returns the existing workspace with this ID, or None if the ID is
+    invalid or unknown.
+    """
+    if not workspace_id or not WORKSPACE_ID_PATTERN.match(workspace_id):
+        return None
+
+    workspace = Workspace(workspace_id, root)
+    if not os.path.isdir(workspace.path):
+        return None
+
+    workspace.ensure_dirs()
+    workspace.touch()
+    return workspace
+
+def get_or_create_workspace(workspace_id, root):
+    return get_workspace(workspace_id, root) or create_workspace(root)
+
+def purge_old_workspaces(root, max_age=WORKSPACE_TTL):
+    if not os.path.isdir(root):
+        return
+
+    cutoff = time.time() - max_age
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        try:
+            if WORKSPACE_ID_PATTERN.match(name) and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                print(f"Removed expired workspace {name}")
+        except OSError as e:
+            print(f"Error removing workspace {name}: {e}")
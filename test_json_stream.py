@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test the streamed JSON array parser used for scene prompts
+"""
+
+import sys
+
+# Add current directory to path to import our modules
+sys.path.append('.')
+
+from utils.json_stream import JsonArrayStreamParser, iter_json_array
+
+def chunked(text, size):
+    """Split text into chunks of size characters, like a streamed response"""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def test_fenced_input():
+    text = 'Here you go:\n```json\n[{"scene_number": 1}, {"scene_number": 2}]\n```'
+    assert list(iter_json_array(chunked(text, 5))) == [{'scene_number': 1}, {'scene_number': 2}]
+
+def test_nested_braces():
+    text = '[{"a": {"b": [1, {"c": 2}]}, "d": [[3]]}, {"e": {}}]'
+    for size in (1, 3, len(text)):
+        assert list(iter_json_array(chunked(text, size))) == [{'a': {'b': [1, {'c': 2}]}, 'd': [[3]]}, {'e': {}}]
+
+def test_strings_with_brackets():
+    text = r'[{"prompt": "arrows } and ] and { [ \"quoted }\" \\"}, {"x": 1}]'
+    expected = [{'prompt': 'arrows } and ] and { [ "quoted }" \\'}, {'x': 1}]
+    for size in (1, 7, len(text)):
+        assert list(iter_json_array(chunked(text, size))) == expected
+
+def test_objects_arrive_before_array_ends():
+    parser = JsonArrayStreamParser()
+    assert parser.feed('[{"a": 1}, {"b"') == [{'a': 1}]
+    assert parser.feed(': 2}]') == [{'b': 2}]
+    assert parser.finished
+
+def test_truncated_array_raises():
+    received = []
+    try:
+        for obj in iter_json_array(['[{"a":1},{"b":2},{"c":']):
+            received.append(obj)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("truncated array did not raise")
+    assert received == [{'a': 1}, {'b': 2}]
+
+def test_missing_array_raises():
+    try:
+        list(iter_json_array(['Sorry, I cannot help with that.']))
+    except ValueError:
+        return
+    raise AssertionError("response without an array did not raise")
+
+def main():
+    """Main test function"""
+    print("🧪 JSON Stream Parser Test Suite")
+    print("=" * 50)
+
+    tests = [
+        test_fenced_input,
+        test_nested_braces,
+        test_strings_with_brackets,
+        test_objects_arrive_before_array_ends,
+        test_truncated_array_raises,
+        test_missing_array_raises,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print("\n" + "=" * 50)
+    if failed:
+        print(f"❌ {failed} of {len(tests)} tests failed")
+        sys.exit(1)
+    print(f"🎉 All {len(tests)} tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import json
+
+class JsonArrayStreamParser:
+    """
+    Incrementally parses a JSON array of objects from text chunks
+    (e.g. a streamed LLM completion). feed() returns each object as soon as
+    its closing brace arrives, instead of waiting for the whole array.
+    Text before the opening '[' (such as a ```json fence) and after the
+    closing ']' is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.started = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.object_start = None
+
+    def feed(self, text):
+        """
+        Adds a chunk of text and returns the list of objects completed by it.
+        """
+        objects = []
+        if self.finished:
+            return objects
+
+        self.buffer += text
+        while self.pos < len(self.buffer):
+            char = self.buffer[self.pos]
+
+            if not self.started:
+                if char == '[':
+                    self.started = True
+                    self.depth = 1
+            elif self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                if self.depth == 1 and char == '{':
+                    self.object_start = self.pos
+                self.depth += 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 1 and char == '}' and self.object_start is not None:
+                    objects.append(json.loads(self.buffer[self.object_start:self.pos + 1]))
+                    self.object_start = None
+                elif self.depth == 0:
+                    self.finished = True
+                    break
+
+            self.pos += 1
+
+        # Drop text we no longer need so long streams don't grow the buffer
+        keep_from = self.object_start if self.object_start is not None else self.pos
+        self.buffer = self.buffer[keep_from:]
+        self.pos -= keep_from
+        if self.object_start is not None:
+            self.object_start = 0
+
+        return objects
+
+def iter_json_array(chunks):
+    """
+    Yields each object of a streamed JSON array as soon as it is complete.
+    Raises ValueError once the chunks run out if the array never started or
+    was cut off before its closing ']' (e.g. the response hit max_tokens or
+    the connection dropped); objects already yielded are still valid.
+    """
+    parser = JsonArrayStreamParser()
+    for chunk in chunks:
+        for obj in parser.feed(chunk):
+            yield obj
+        if parser.finished:
+            break
+
+    if not parser.started:
+        raise ValueError("No JSON array found in response")
+    if not parser.finished:
+        raise ValueError("JSON array in response is incomplete")
@@ -1,6 +1,11 @@
 import os
 import json
-from groq import Groq
+from services.http_clients import get_groq_client
+from services.outbound_scheduler import scheduler
+from services.llm_cache import llm_cache, llm_key
+from utils.script_splitter import SCENE_SEPARATOR
+
+SCRIPT_MODEL = "llama-3.3-70b-versatile"
 
 # Initialize Groq client
 # Note: Client will look for GROQ_API_KEY in environment variables
@@ -8,24 +13,17 @@ def get_client():
     api_key = os.environ.get("GROQ_API_KEY")
     if not api_key:
         raise ValueError("GROQ_API_KEY environment variable not set")
-    return Groq(api_key=api_key)
+    return get_groq_client(api_key)
 
-def generate_script_from_topic(topic, profile=None):
-    """
-    Generates a teaching script based on the provided topic and student profile.
-    """
-    client = get_client()
+DEFAULT_PROFILE = {
+    "knowledge_level": "beginner",
+    "english_level": "normal",
+    "examples_needed": "yes",
+    "confidence_level": "medium",
+    "learning_speed": "normal"
+}
 
-    # Default profile if none provided
-    if not profile:
-        profile = {
-            "knowledge_level": "beginner",
-            "english_level": "normal",
-            "examples_needed": "yes",
-            "confidence_level": "medium",
-            "learning_speed": "normal"
-        }
-    
+def build_script_messages(topic, profile):
     system_prompt = f"""You are an adaptive AI teacher.
 
     TASK:
@@ -55,15 +53,96 @@ def generate_script_from_topic(topic, profile=None):
     Do not number the scenes yourself, just use the separator.
     """
     
-    response = client.chat.completions.create(
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"TOPIC: {topic}"}
-        ],
-        model="llama-3.3-70b-versatile",
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"TOPIC: {topic}"}
+    ]
+
+def generate_script_from_topic(topic, profile=None, use_cache=True):
+    """
+    Generates a teaching script based on the provided topic and student profile.
+    Pass use_cache=False to force a fresh script (the result still refreshes the cache).
+    """
+    # Default profile if none provided
+    profile = profile or DEFAULT_PROFILE
+    
+    cache_key = llm_key(SCRIPT_MODEL, topic, profile)
+    if use_cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            print(f"LLM cache hit for script: {topic}")
+            return cached
+    
+    client = get_client()
+    
+    response = scheduler.call(
+        'groq',
+        client.chat.completions.create,
+        messages=build_script_messages(topic, profile),
+        model=SCRIPT_MODEL,
     )
     
-    return response.choices[0].message.content
+    script = response.choices[0].message.content
+    llm_cache.set(cache_key, script)
+    return script
+
+def _partial_separator_length(text):
+    """
+    Length of the longest suffix of text that could be the start of a
+    scene separator split across two chunks.
+    """
+    for length in range(min(len(SCENE_SEPARATOR) - 1, len(text)), 0, -1):
+        if SCENE_SEPARATOR.startswith(text[-length:]):
+            return length
+    return 0
+
+def stream_script_from_topic(topic, profile=None, use_cache=True):
+    """
+    Same as generate_script_from_topic, but yields the script in chunks as
+    Groq produces them. A [SCENE] separator is never split across chunks.
+    The full script is cached once the stream completes.
+    """
+    profile = profile or DEFAULT_PROFILE
+    
+    cache_key = llm_key(SCRIPT_MODEL, topic, profile)
+    if use_cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            print(f"LLM cache hit for script: {topic}")
+            yield cached
+            return
+    
+    client = get_client()
+    
+    stream = scheduler.call(
+        'groq',
+        client.chat.completions.create,
+        messages=build_script_messages(topic, profile),
+        model=SCRIPT_MODEL,
+        stream=True
+    )
+    
+    parts = []
+    pending = ""
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        parts.append(delta)
+        pending += delta
+        
+        # Hold back anything that might be the first half of a separator
+        held = _partial_separator_length(pending)
+        ready, pending = pending[:len(pending) - held], pending[len(pending) - held:]
+        if ready:
+            yield ready
+    
+    if pending:
+        yield pending
+    
+    llm_cache.set(cache_key, "".join(parts))
 
 def generate_scene_prompts(script):
     """
@@ -95,7 +174,9 @@ def generate_scene_prompts(script):
     ]
     """
     
-    response = client.chat.completions.create(
+    response = scheduler.call(
+        'groq',
+        client.chat.completions.create,
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": f"Script to visualize:\n\n{script}"}
@@ -1,5 +1,8 @@
 import re
 
+# Marks the start of a new scene in a generated script
+SCENE_SEPARATOR = "[SCENE]"
+
 def clean_script_text(text):
     """
     Cleans up the script text by removing any potential markdown artifacts or unwanted whitespace.
@@ -15,32 +18,46 @@ def clean_script_text(text):
     
     return text
 
+def split_script_scenes(text):
+    """
+    Splits a script on its scene separators and cleans each part.
+    Returns the non-empty scene texts in order.
+    """
+    if not text:
+        return []
+    
+    scenes = [clean_script_text(part) for part in text.split(SCENE_SEPARATOR)]
+    return [scene for scene in scenes if scene]
+
+def validate_scene(scene, index):
+    """
+    Validates a single scene returned by the LLM (index is its 0-based position).
+    Ensures the scene has the required keys.
+    """
+    # Ensure distinct scene numbers
+    scene_num = scene.get('scene_number', index + 1)
+    
+    # Ensure we have a prompt
+    prompt = scene.get('image_prompt', 'Educational illustration with white background')
+    
+    # Ensure visual style keywords are present (redundancy check - though prompt generator should handle this)
+    # We relax this check slightly as the new prompt generator has strict rules, 
+    # but ensuring "white background" is always good for this style.
+    if "white background" not in prompt.lower():
+        prompt += ", white background"
+        
+    return {
+        "scene_number": scene_num,
+        "concept": scene.get('concept', f"Scene {scene_num}"),
+        "diagram_type": scene.get('diagram_type', "illustration"),
+        "visual_elements": scene.get('visual_elements', []),
+        "relationships": scene.get('relationships', []),
+        "image_prompt": prompt
+    }
+
 def validate_scene_data(scenes):
     """
     Validates the structure of the scene data returned by the LLM.
     Ensures each scene has the required keys.
     """
-    validated_scenes = []
-    for i, scene in enumerate(scenes):
-        # Ensure distinct scene numbers
-        scene_num = scene.get('scene_number', i + 1)
-        
-        # Ensure we have a prompt
-        prompt = scene.get('image_prompt', 'Educational illustration with white background')
-        
-        # Ensure visual style keywords are present (redundancy check - though prompt generator should handle this)
-        # We relax this check slightly as the new prompt generator has strict rules, 
-        # but ensuring "white background" is always good for this style.
-        if "white background" not in prompt.lower():
-            prompt += ", white background"
-            
-        validated_scenes.append({
-            "scene_number": scene_num,
-            "concept": scene.get('concept', f"Scene {scene_num}"),
-            "diagram_type": scene.get('diagram_type', "illustration"),
-            "visual_elements": scene.get('visual_elements', []),
-            "relationships": scene.get('relationships', []),
-            "image_prompt": prompt
-        })
-        
-    return validated_scenes
+    return [validate_scene(scene, i) for i, scene in enumerate(scenes)]